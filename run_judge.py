@@ -7,6 +7,8 @@ the assembled final_document.md.
 Usage:
     python run_judge.py outputs/p4_10/
     python run_judge.py outputs/p4_10/ --model gpt-4o-mini
+    python run_judge.py outputs/p4_10/ --batch
+    python run_judge.py outputs/p4_10/ --no-cache
 """
 
 import argparse
@@ -31,6 +33,16 @@ def main():
         default="gpt-4o",
         help="OpenAI model to use (default: gpt-4o)"
     )
+    parser.add_argument(
+        "--batch",
+        action="store_true",
+        help="Submit chunks via the OpenAI Batch API (half price, may take up to 24h)"
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Ignore cached judge responses and call the API for every chunk (refreshes the cache)"
+    )
 
     args = parser.parse_args()
     output_dir = Path(args.output_dir)
@@ -45,7 +57,8 @@ def main():
         sys.exit(1)
 
     try:
-        judge = DocumentJudge(output_dir, model=args.model)
+        judge = DocumentJudge(output_dir, model=args.model, use_batch=args.batch,
+                              use_cache=not args.no_cache)
         output_path = judge.run()
         print(f"\nNext step: Generate HTML from judged document:")
         print(f"  python convert_to_friendly.py {output_path}")
@@ -3,6 +3,7 @@ Run Document Processing Pipeline
 Simple script to process a single PDF document
 """
 
+import logging
 import os
 import sys
 from pathlib import Path
@@ -17,6 +18,11 @@ def main():
     # Load environment variables
     load_dotenv()
 
+    # Per-table diagnostics are logged at DEBUG level; PIPELINE_DEBUG=1 shows them
+    logging.basicConfig(format="%(message)s")
+    if os.getenv("PIPELINE_DEBUG"):
+        logging.getLogger("src.pipeline").setLevel(logging.DEBUG)
+
     # Check for API key
     if not os.getenv("OPENAI_API_KEY"):
         print("ERROR: OPENAI_API_KEY not found in environment")
@@ -12,6 +12,11 @@ import base64
 from dataclasses import dataclass
 import shutil
 
+try:
+    from yaml import CSafeLoader as _SafeLoader
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeLoader as _SafeLoader
+
 
 @dataclass
 class DocumentEntity:
@@ -36,6 +41,9 @@ class DocumentConverter:
         self.metadata = {}
         self.entities: List[DocumentEntity] = []
 
+        # UTF-8 bytes of the last generated HTML (set by generate_html)
+        self.html_bytes: bytes | None = None
+
     def convert(self) -> Path:
         """Main conversion workflow"""
         print(f"Converting {self.markdown_path.name} to user-friendly HTML...")
@@ -63,7 +71,7 @@ class DocumentConverter:
         frontmatter_match = re.match(r'^---\n(.*?)\n---\n', content, re.DOTALL)
         if frontmatter_match:
             frontmatter_text = frontmatter_match.group(1)
-            self.metadata = yaml.safe_load(frontmatter_text)
+            self.metadata = yaml.load(frontmatter_text, Loader=_SafeLoader)
             self.document_title = self.metadata.get('document_title', 'Document')
             content = content[frontmatter_match.end():]
 
@@ -117,7 +125,7 @@ class DocumentConverter:
         yaml_content = yaml_match.group(1)
 
         try:
-            data = yaml.safe_load(yaml_content)
+            data = yaml.load(yaml_content, Loader=_SafeLoader)
 
             # Handle different table structures
             if 'table' in data:
@@ -490,9 +498,11 @@ class DocumentConverter:
         # Generate full HTML
         html = self._get_html_template(entities_html)
 
-        # Write output file
+        # Write output file (keep the encoded bytes so callers can serve them
+        # without reading the file back)
         output_path = self.output_dir / f"{self.markdown_path.stem}_friendly.html"
-        output_path.write_text(html, encoding='utf-8')
+        self.html_bytes = html.encode('utf-8')
+        output_path.write_bytes(self.html_bytes)
 
         return output_path
 
@@ -9,15 +9,165 @@ Usage:
 """
 
 import argparse
+import hashlib
+import mimetypes
+import types
+import itertools
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, fields, MISSING
+from functools import lru_cache
 from pathlib import Path
-from flask import Flask, render_template, send_file, jsonify, request
-import yaml
+from typing import Literal, Optional, Union, get_args, get_origin, get_type_hints
+from flask import Flask, Response, abort, render_template, send_file, jsonify, request, stream_with_context
+from flask.json.provider import DefaultJSONProvider
+import httpx
 import webbrowser
 import threading
 import time
 import asyncio
 from .correction_manager import CorrectionManager
 
+# Web assets live at the project root (2 levels up from src/corrections/);
+# resolved once at import rather than on every create_app() call
+_PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+_TEMPLATE_FOLDER = str(_PROJECT_ROOT / 'web' / 'templates')
+_STATIC_FOLDER = _PROJECT_ROOT / 'web' / 'static'
+
+# Maximum number of entity payloads kept by the viewer's LRU cache
+ENTITY_CACHE_SIZE = 512
+
+# Static asset URLs carry a content hash, so browsers may cache them forever
+STATIC_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+
+try:
+    import orjson
+except ImportError:  # Optional: fall back to Flask's stdlib json provider
+    orjson = None
+
+try:
+    from flask_compress import Compress
+except ImportError:  # Optional: responses are sent uncompressed
+    Compress = None
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """Flask JSON provider backed by orjson (C-accelerated encode/decode)"""
+
+    def dumps(self, obj, **kwargs) -> str:
+        option = orjson.OPT_NON_STR_KEYS
+        if kwargs.get('sort_keys', self.sort_keys):
+            option |= orjson.OPT_SORT_KEYS
+        if kwargs.get('indent'):
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=self.default, option=option).decode('utf-8')
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+
+# Request body schemas for the correction API
+
+@dataclass(frozen=True)
+class CorrectWithAIRequest:
+    """Body of POST /api/correct-with-ai"""
+    entity_id: str
+    user_prompt: str
+
+
+@dataclass(frozen=True)
+class SaveCorrectionRequest:
+    """Body of POST /api/save-correction"""
+    entity_id: str
+    corrected_content: str
+    correction_type: Literal["manual", "ai"]
+    reason: str
+    user_prompt: Optional[str] = None
+
+
+@dataclass(frozen=True)
+class DocumentWideCorrectionRequest:
+    """Body of POST /api/document-wide-correction"""
+    user_prompt: str
+    bulk: bool = False
+
+
+@dataclass(frozen=True)
+class ApplyDocumentWideCorrectionsRequest:
+    """Body of POST /api/apply-document-wide-corrections"""
+    corrections: list[dict]
+    user_prompt: str
+
+
+class RequestValidationError(ValueError):
+    """Raised when a request body does not match its schema (HTTP 400)"""
+
+
+@lru_cache(maxsize=None)
+def _schema_fields(schema: type) -> tuple:
+    """
+    Resolve a schema's fields once into (name, required, type, allowed_values)
+
+    Literal fields carry their allowed values; Optional fields are unwrapped
+    to their inner type.
+    """
+    hints = get_type_hints(schema)
+    specs = []
+    for field in fields(schema):
+        hint = hints[field.name]
+        origin = get_origin(hint)
+        allowed = None
+        if origin is Literal:
+            allowed = get_args(hint)
+            expected = type(allowed[0])
+        elif origin in (Union, types.UnionType):
+            expected = next(arg for arg in get_args(hint) if arg is not type(None))
+        else:
+            expected = origin or hint
+        specs.append((field.name, field.default is MISSING, expected, allowed))
+    return tuple(specs)
+
+
+def _join_names(names: list[str]) -> str:
+    """Join field names for error messages: 'a and b', 'a, b, and c'"""
+    if len(names) <= 2:
+        return ' and '.join(names)
+    return ', '.join(names[:-1]) + ', and ' + names[-1]
+
+
+def decode_request(schema: type):
+    """
+    Decode the current request's JSON body into a schema instance
+
+    Required fields must be present and non-empty, Literal fields must hold
+    one of their allowed values.
+
+    Raises:
+        RequestValidationError: If the body does not match the schema
+    """
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict):
+        raise RequestValidationError('Request body must be a JSON object')
+
+    specs = _schema_fields(schema)
+    missing = [name for name, required, _, _ in specs if required and not data.get(name)]
+    if missing:
+        raise RequestValidationError(f'{_join_names(missing)} required')
+
+    values = {}
+    for name, required, expected, allowed in specs:
+        value = data.get(name)
+        if value is None:
+            continue
+        if not isinstance(value, expected):
+            raise RequestValidationError(f'{name} must be of type {expected.__name__}')
+        if allowed is not None and value not in allowed:
+            options = ' or '.join(f'"{option}"' for option in allowed)
+            raise RequestValidationError(f'{name} must be {options}')
+        values[name] = value
+
+    return schema(**values)
+
 
 class ComparisonViewer:
     """PDF-HTML comparison viewer with synchronized navigation"""
@@ -37,34 +187,185 @@ class ComparisonViewer:
                 f"Generate it first: python convert_to_friendly.py {self.output_dir}/final_document.md"
             )
 
-        # Load manifest for page mapping
-        self.manifest = self._load_manifest()
+        # Long-lived event loop for AI calls, so the pooled HTTP client below
+        # (bound to this loop) keeps TCP/TLS connections across requests
+        self._loop = asyncio.new_event_loop()
+        threading.Thread(target=self._loop.run_forever, daemon=True).start()
+        self._http_client = httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=32, max_keepalive_connections=16),
+            timeout=httpx.Timeout(600.0, connect=5.0),
+        )
 
         # Initialize CorrectionManager with html_path so it knows which
         # source markdown to read (judge vs regular) for entity content
-        self.correction_manager = CorrectionManager(self.output_dir, html_path=self.html_path)
+        self.correction_manager = CorrectionManager(
+            self.output_dir, html_path=self.html_path, http_client=self._http_client
+        )
 
-    def _load_manifest(self):
-        """Load manifest.yaml if it exists"""
-        if self.manifest_path.exists():
-            try:
-                with open(self.manifest_path) as f:
-                    return yaml.safe_load(f)
-            except Exception as e:
-                print(f"Warning: Could not load manifest: {e}")
-                return {}
-        return {}
+        # Manifest for page mapping, shared with the manager's parsed cache
+        self.manifest = self.correction_manager.get_manifest()
+
+        # In-memory copy of the served HTML, keyed on (path, mtime_ns, size)
+        self._html_cache = None
+
+        # HTML regeneration runs in the background on a single worker, so
+        # rebuilds stay in correction order. Every correction and rebuild
+        # holds _edit_lock, since the manager does not serialize writes to
+        # its files and caches
+        self._regen_pool = ThreadPoolExecutor(max_workers=1)
+        self._regen_future = None
+        self._edit_lock = threading.Lock()
+
+        # LRU cache of entity payloads, keyed on (entity_id, source md mtime_ns)
+        self._entity_cache: OrderedDict[tuple, dict] = OrderedDict()
+        self._entity_cache_lock = threading.Lock()
+
+    def _html_cache_key(self, html_path: Path) -> tuple:
+        """Cache key identifying the current on-disk version of an HTML file"""
+        st = html_path.stat()
+        return (str(html_path), st.st_mtime_ns, st.st_size)
+
+    def _prime_html_cache(self, html_path: Path, html_bytes: bytes) -> None:
+        """Store freshly generated HTML so the next fetch needs no disk I/O"""
+        self._html_cache = {
+            'key': self._html_cache_key(html_path),
+            'bytes': html_bytes,
+            'text': html_bytes.decode('utf-8'),
+        }
+
+    def _run_async(self, coro):
+        """Run a coroutine on the viewer's event loop and wait for its result"""
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result()
+
+    def _iter_async(self, agen):
+        """Iterate an async generator on the viewer's event loop from a request thread"""
+        try:
+            while True:
+                try:
+                    yield self._run_async(agen.__anext__())
+                except StopAsyncIteration:
+                    return
+        finally:
+            self._run_async(agen.aclose())
+
+    def shutdown(self) -> None:
+        """Stop background work, close the shared HTTP client and the event loop"""
+        self._regen_pool.shutdown(wait=True)
+        if self._loop.is_running():
+            self._run_async(self._http_client.aclose())
+            self._loop.call_soon_threadsafe(self._loop.stop)
+
+    def _regenerate_html(self) -> Path:
+        """Regenerate HTML and serve the result from memory (runs on the regen pool)"""
+        with self._edit_lock:
+            html_path, html_bytes = self.correction_manager.regenerate_html()
+        self.html_path = html_path
+        self._prime_html_cache(html_path, html_bytes)
+        return html_path
+
+    def _apply_document_wide(self, corrections: list[dict], user_prompt: str) -> dict:
+        """Apply document-wide corrections and regenerate HTML (runs on the regen pool)"""
+        with self._edit_lock:
+            return self.correction_manager.apply_document_wide_corrections(corrections, user_prompt)
+
+    def _get_entity_data(self, entity_id: str) -> dict:
+        """Return entity content for editing, served from the LRU cache when fresh"""
+        key = (entity_id, self.correction_manager.source_md_mtime_ns())
+        with self._entity_cache_lock:
+            hit = self._entity_cache.get(key)
+            if hit is not None:
+                self._entity_cache.move_to_end(key)
+                return hit
+
+        entity_data = self.correction_manager.get_entity_content(entity_id)
+
+        with self._entity_cache_lock:
+            self._entity_cache[key] = entity_data
+            if len(self._entity_cache) > ENTITY_CACHE_SIZE:
+                self._entity_cache.popitem(last=False)
+        return entity_data
+
+    def _clear_entity_cache(self) -> None:
+        """Drop all cached entity payloads (call after corrections)"""
+        with self._entity_cache_lock:
+            self._entity_cache.clear()
+
+    def _load_static_assets(self, static_folder: Path) -> dict[str, tuple[bytes, str, str]]:
+        """
+        Read all static assets into memory
+
+        Returns:
+            Dictionary of relative path -> (content, mimetype, etag)
+        """
+        assets = {}
+        for path in static_folder.rglob('*'):
+            if not path.is_file():
+                continue
+            data = path.read_bytes()
+            mimetype = mimetypes.guess_type(path.name)[0] or 'application/octet-stream'
+            etag = hashlib.blake2b(data, digest_size=8).hexdigest()
+            assets[path.relative_to(static_folder).as_posix()] = (data, mimetype, etag)
+        return assets
+
+    def _get_html_text(self) -> str:
+        """Return the current HTML content, re-reading only if the file changed"""
+        key = self._html_cache_key(self.html_path)
+        if self._html_cache is None or self._html_cache['key'] != key:
+            self._prime_html_cache(self.html_path, self.html_path.read_bytes())
+        return self._html_cache['text']
 
     def create_app(self):
         """Create and configure Flask application"""
-        # Get project root (2 levels up from src/corrections/)
-        project_root = Path(__file__).parent.parent.parent
-        template_folder = project_root / 'web' / 'templates'
-        static_folder = project_root / 'web' / 'static'
-
+        # Static assets are served from memory by serve_static() below
         app = Flask(__name__,
-                   template_folder=str(template_folder),
-                   static_folder=str(static_folder))
+                   template_folder=_TEMPLATE_FOLDER,
+                   static_folder=None)
+        self._static_assets = self._load_static_assets(_STATIC_FOLDER)
+
+        # Large payloads (document-wide proposals, corrections list) are
+        # string-heavy; orjson encodes them several times faster than stdlib json
+        if orjson is not None:
+            app.json = OrjsonProvider(app)
+
+        # HTML and JSON payloads compress 5-10x, which matters when the
+        # viewer is used over an SSH tunnel or remote session
+        if Compress is not None:
+            app.config['COMPRESS_MIMETYPES'] = [
+                'text/html', 'application/json', 'text/css', 'application/javascript'
+            ]
+            app.config['COMPRESS_LEVEL'] = 5
+            app.config['COMPRESS_MIN_SIZE'] = 1024
+            app.config['COMPRESS_ALGORITHM'] = ['br', 'gzip']
+            Compress(app)
+
+        @app.errorhandler(RequestValidationError)
+        def handle_validation_error(e):
+            """Reject malformed request bodies"""
+            return jsonify({'error': str(e)}), 400
+
+        @app.route('/static/<path:filename>', endpoint='static')
+        def serve_static(filename):
+            """Serve a static asset from memory with long-lived caching"""
+            asset = self._static_assets.get(filename)
+            if asset is None:
+                abort(404)
+
+            data, mimetype, etag = asset
+            if request.if_none_match.contains(etag):
+                response = Response(status=304)
+            else:
+                response = Response(data, mimetype=mimetype)
+            response.set_etag(etag)
+            response.headers['Cache-Control'] = STATIC_CACHE_CONTROL
+            return response
+
+        @app.url_defaults
+        def version_static_urls(endpoint, values):
+            """Append the content hash to static URLs so edits bust the cache"""
+            if endpoint == 'static' and 'filename' in values:
+                asset = self._static_assets.get(values['filename'])
+                if asset is not None:
+                    values.setdefault('v', asset[2])
 
         @app.route('/')
         def index():
@@ -89,8 +390,7 @@ class ComparisonViewer:
         @app.route('/html/content')
         def get_html_content():
             """Return HTML content as JSON for client-side rendering"""
-            content = self.html_path.read_text(encoding='utf-8')
-            return jsonify({'content': content})
+            return jsonify({'content': self._get_html_text()})
 
         @app.route('/health')
         def health():
@@ -106,12 +406,13 @@ class ComparisonViewer:
             Response: {entity_id, type, page, content, metadata}
             """
             try:
-                entity_data = self.correction_manager.get_entity_content(entity_id)
-                return jsonify(entity_data)
+                return jsonify(self._get_entity_data(entity_id))
             except ValueError as e:
                 return jsonify({'error': str(e)}), 404
             except FileNotFoundError as e:
                 return jsonify({'error': str(e)}), 404
+            except KeyError as e:
+                return jsonify({'error': e.args[0]}), 404
             except Exception as e:
                 return jsonify({'error': f'Internal error: {str(e)}'}), 500
 
@@ -122,84 +423,127 @@ class ComparisonViewer:
             Request: {entity_id, user_prompt}
             Response: {corrected_content}
             """
+            body = decode_request(CorrectWithAIRequest)
+
             try:
-                data = request.get_json()
-                entity_id = data.get('entity_id')
-                user_prompt = data.get('user_prompt')
-
-                if not entity_id or not user_prompt:
-                    return jsonify({'error': 'entity_id and user_prompt required'}), 400
-
-                # Run async correct_with_ai
-                loop = asyncio.new_event_loop()
-                asyncio.set_event_loop(loop)
-                corrected_content = loop.run_until_complete(
-                    self.correction_manager.correct_with_ai(entity_id, user_prompt)
+                # Run async correct_with_ai on the shared loop
+                corrected_content = self._run_async(
+                    self.correction_manager.correct_with_ai(body.entity_id, body.user_prompt)
                 )
-                loop.close()
 
                 return jsonify({'corrected_content': corrected_content})
 
             except ValueError as e:
                 return jsonify({'error': str(e)}), 400
+            except KeyError as e:
+                return jsonify({'error': e.args[0]}), 404
+            except Exception as e:
+                return jsonify({'error': f'AI correction failed: {str(e)}'}), 500
+
+        @app.route('/api/correct-with-ai/stream', methods=['POST'])
+        def stream_correction_with_ai():
+            """
+            POST: AI-assisted correction, streamed as it is generated
+            Request: {entity_id, user_prompt}
+            Response: NDJSON lines {delta}, ..., then {corrected_content} or {error}
+            """
+            body = decode_request(CorrectWithAIRequest)
+            deltas = self._iter_async(
+                self.correction_manager.stream_correction_with_ai(body.entity_id, body.user_prompt)
+            )
+
+            try:
+                # Pull the first delta here, so lookup and API errors still
+                # get a status code before the stream starts
+                first = list(itertools.islice(deltas, 1))
+            except ValueError as e:
+                return jsonify({'error': str(e)}), 400
+            except KeyError as e:
+                return jsonify({'error': e.args[0]}), 404
             except Exception as e:
                 return jsonify({'error': f'AI correction failed: {str(e)}'}), 500
 
+            def generate():
+                try:
+                    for delta in itertools.chain(first, deltas):
+                        yield app.json.dumps({'delta': delta}) + '\n'
+                    # The finished stream is in the AI response cache, so this
+                    # returns the cleaned content without another API call
+                    corrected_content = self._run_async(
+                        self.correction_manager.correct_with_ai(body.entity_id, body.user_prompt)
+                    )
+                    yield app.json.dumps({'corrected_content': corrected_content}) + '\n'
+                except Exception as e:
+                    yield app.json.dumps({'error': f'AI correction failed: {str(e)}'}) + '\n'
+
+            return Response(
+                stream_with_context(generate()),
+                mimetype='application/x-ndjson',
+                headers={'Cache-Control': 'no-cache'}
+            )
+
         @app.route('/api/save-correction', methods=['POST'])
         def save_correction():
             """
-            POST: Save correction and regenerate HTML
+            POST: Save correction and regenerate HTML in the background
             Request: {entity_id, corrected_content, correction_type, reason, user_prompt?}
-            Response: {success, message}
+            Response (202): {success, status, message, poll}
             """
-            try:
-                data = request.get_json()
-                entity_id = data.get('entity_id')
-                corrected_content = data.get('corrected_content')
-                correction_type = data.get('correction_type')
-                reason = data.get('reason')
-                user_prompt = data.get('user_prompt')
-
-                # Validation
-                if not entity_id or not corrected_content or not correction_type or not reason:
-                    return jsonify({
-                        'error': 'entity_id, corrected_content, correction_type, and reason required'
-                    }), 400
-
-                if correction_type not in ['manual', 'ai']:
-                    return jsonify({'error': 'correction_type must be "manual" or "ai"'}), 400
+            body = decode_request(SaveCorrectionRequest)
 
+            try:
                 # Apply correction
-                self.correction_manager.apply_correction(
-                    entity_id=entity_id,
-                    corrected_content=corrected_content,
-                    correction_type=correction_type,
-                    reason=reason,
-                    user_prompt=user_prompt
-                )
-
-                # Invalidate cache so next entity fetch reflects changes
-                self.correction_manager.invalidate_cache()
+                with self._edit_lock:
+                    self.correction_manager.apply_correction(
+                        entity_id=body.entity_id,
+                        corrected_content=body.corrected_content,
+                        correction_type=body.correction_type,
+                        reason=body.reason,
+                        user_prompt=body.user_prompt,
+                        # The background regeneration below writes manifest.yaml
+                        flush_manifest=False
+                    )
 
-                # Regenerate HTML
-                html_path = self.correction_manager.regenerate_html()
+                # Drop cached entity payloads; the manager patches its own
+                # markdown index in place
+                self._clear_entity_cache()
 
-                # Update html_path reference
-                self.html_path = html_path
+                # Regenerate HTML in the background; clients poll regen-status
+                self._regen_future = self._regen_pool.submit(self._regenerate_html)
 
                 return jsonify({
                     'success': True,
-                    'message': f'Correction saved and HTML regenerated',
-                    'html_path': '/html/content'
-                })
+                    'status': 'regenerating',
+                    'message': 'Correction saved, HTML regenerating',
+                    'poll': '/api/regen-status'
+                }), 202
 
             except ValueError as e:
                 return jsonify({'error': str(e)}), 400
             except FileNotFoundError as e:
                 return jsonify({'error': str(e)}), 404
+            except KeyError as e:
+                return jsonify({'error': e.args[0]}), 404
             except Exception as e:
                 return jsonify({'error': f'Save failed: {str(e)}'}), 500
 
+        @app.route('/api/regen-status')
+        def regen_status():
+            """
+            GET: Report whether background HTML regeneration has finished
+            Response: {done, html_path?} or {done, error}
+            """
+            future = self._regen_future
+            if future is None:
+                return jsonify({'done': True, 'html_path': '/html/content'})
+            if not future.done():
+                return jsonify({'done': False})
+
+            error = future.exception()
+            if error is not None:
+                return jsonify({'done': True, 'error': f'HTML regeneration failed: {error}'}), 500
+            return jsonify({'done': True, 'html_path': '/html/content'})
+
         @app.route('/api/corrections')
         def list_corrections():
             """
@@ -216,25 +560,16 @@ class ComparisonViewer:
         def document_wide_correction():
             """
             POST: Analyze entire document and propose AI corrections
-            Request: {user_prompt: "Fix all dates to YYYY-MM-DD format"}
+            Request: {user_prompt: "Fix all dates to YYYY-MM-DD format", bulk?: false}
             Response: {proposed_changes: [{entity_id, original_content, corrected_content, reason}]}
             """
-            try:
-                data = request.get_json()
-                user_prompt = data.get('user_prompt')
-
-                if not user_prompt:
-                    return jsonify({'error': 'user_prompt required'}), 400
+            body = decode_request(DocumentWideCorrectionRequest)
 
-                # Get proposed changes from AI (run async function synchronously)
-                loop = asyncio.new_event_loop()
-                asyncio.set_event_loop(loop)
-                try:
-                    proposed_changes = loop.run_until_complete(
-                        self.correction_manager.document_wide_correction(user_prompt)
-                    )
-                finally:
-                    loop.close()
+            try:
+                # Get proposed changes from AI (run on the shared loop and wait)
+                proposed_changes = self._run_async(
+                    self.correction_manager.document_wide_correction(body.user_prompt, bulk=body.bulk)
+                )
 
                 return jsonify({
                     'success': True,
@@ -256,19 +591,18 @@ class ComparisonViewer:
             Request: {corrections: [...], user_prompt: "..."}
             Response: {success, corrections_applied, html_path}
             """
-            try:
-                data = request.get_json()
-                corrections = data.get('corrections')
-                user_prompt = data.get('user_prompt')
+            body = decode_request(ApplyDocumentWideCorrectionsRequest)
 
-                if not corrections or not user_prompt:
-                    return jsonify({'error': 'corrections and user_prompt required'}), 400
-
-                # Apply all corrections
-                result = self.correction_manager.apply_document_wide_corrections(corrections, user_prompt)
+            try:
+                # Apply all corrections on the regen pool, after any pending
+                # rebuild, and wait for the result
+                self._regen_future = self._regen_pool.submit(
+                    self._apply_document_wide, body.corrections, body.user_prompt
+                )
+                result = self._regen_future.result()
 
-                # Invalidate cache and update html_path reference
-                self.correction_manager.invalidate_cache()
+                # Drop cached entity payloads and update html_path reference
+                self._clear_entity_cache()
                 if result['success']:
                     self.html_path = Path(result['html_path'])
 
@@ -313,6 +647,8 @@ class ComparisonViewer:
                 print(f"Try a different port: python compare_viewer.py {self.pdf_path} {self.output_dir} --port {port + 1}")
             else:
                 raise
+        finally:
+            self.shutdown()
 
 
 def main():
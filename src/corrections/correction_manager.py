@@ -2,23 +2,217 @@
 Correction Manager for Entity-Level Document Corrections
 
 Handles:
-- Loading and saving corrections to corrections.yaml
+- Loading and saving corrections (one corrections/<entity_id>.yaml per entity)
 - Applying corrections to entity files
 - Updating manifest with correction metadata
 - Triggering HTML regeneration
 - AI-assisted corrections via OpenAI API
 """
 
+import asyncio
+import filecmp
+import hashlib
+import json
 import os
 import re
+import tempfile
+import threading
 import yaml
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from pathlib import Path
-from dataclasses import dataclass, asdict
-from typing import Literal, Optional
+from dataclasses import dataclass
+from typing import AsyncIterator, Literal, Optional
 from datetime import datetime
 
+from ..pipeline.pipeline_config import ManifestLoader, ManifestDumper
+
+try:
+    from yaml import CSafeLoader as _SafeLoader
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeLoader as _SafeLoader
+
+try:
+    import orjson
+except ImportError:  # Optional: fall back to the stdlib json module
+    orjson = None
+
+try:
+    import re2 as _marker_re  # google-re2: linear-time DFA scanning
+except ImportError:  # Optional: fall back to the stdlib engine
+    _marker_re = re
+
+
+# Entity marker comments in final_document(.md|_judge.md). The type field
+# never contains '|', so [^|]*? keeps malformed markers from backtracking.
+# Both match raw UTF-8 bytes so the markdown never needs a full decode, and
+# use RE2 when it is installed.
+_ENTITY_MARKER_RE = _marker_re.compile(rb'<!-- Entity: (E\d+) \| Type: [^|]*? \| Page: \d+ -->')
+_CHANGELOG_RE = _marker_re.compile(rb'\n---\s*\n# Judge Change Log')
+
+# Document-wide correction: entity content is sent to the LLM in batches of
+# at most this many characters, with a bounded number of requests in flight
+DOCUMENT_WIDE_BATCH_CHARS = 60_000
+DOCUMENT_WIDE_MAX_CONCURRENT = 8
+
+# Entity file layouts written by corrections, by file extension; unknown
+# extensions get the minimal markdown frontmatter
+_ENTITY_FILE_TEMPLATE_MD = (
+    "---\n"
+    "entity_id: {entity_id}\n"
+    "type: {type}\n"
+    "source_page: {page}\n"
+    "position: {position}\n"
+    "confidence: {confidence}\n"
+    "corrected: true\n"
+    "correction_timestamp: {timestamp}\n"
+    "---\n"
+    "\n"
+    "{content}\n"
+)
+_ENTITY_FILE_TEMPLATE_YAML = (
+    "# Metadata\n"
+    "# entity_id: {entity_id}\n"
+    "# type: {type}\n"
+    "# source_page: {page}\n"
+    "# position: {position}\n"
+    "# confidence: {confidence}\n"
+    "# corrected: true\n"
+    "# correction_timestamp: {timestamp}\n"
+    "\n"
+    "{content}\n"
+)
+_ENTITY_FILE_TEMPLATE_MMD = (
+    "%% Metadata\n"
+    "%% entity_id: {entity_id}\n"
+    "%% type: {type}\n"
+    "%% source_page: {page}\n"
+    "%% position: {position}\n"
+    "%% confidence: {confidence}\n"
+    "%% corrected: true\n"
+    "%% correction_timestamp: {timestamp}\n"
+    "\n"
+    "{content}\n"
+)
+_ENTITY_FILE_TEMPLATE_MINIMAL = (
+    "---\n"
+    "entity_id: {entity_id}\n"
+    "type: {type}\n"
+    "corrected: true\n"
+    "---\n"
+    "\n"
+    "{content}\n"
+)
+_ENTITY_FILE_TEMPLATES = {
+    '.md': _ENTITY_FILE_TEMPLATE_MD,
+    '.yaml': _ENTITY_FILE_TEMPLATE_YAML,
+    '.yml': _ENTITY_FILE_TEMPLATE_YAML,
+    '.mmd': _ENTITY_FILE_TEMPLATE_MMD,
+}
+
+# First body line of a YAML (``#``) or Mermaid (``%%``) entity file, i.e. the
+# first non-blank line after the leading comment frontmatter
+_YAML_BODY_RE = re.compile(r'(?m)^(?!#)[ \t]*\S')
+_MMD_BODY_RE = re.compile(r'(?m)^(?!%%)[ \t]*\S')
+
+# Part of every rendered-fragment cache key; bump when entity rendering
+# changes so that fragments cached by an older version are re-rendered
+FRAGMENT_CACHE_VERSION = 2
+
+# Models used for single-entity and document-wide AI corrections
+CORRECTION_MODEL = "gpt-4o-mini"
+DOCUMENT_WIDE_MODEL = "gpt-4o"
+
+# System prompt per entity type (lowercase type name) for single-entity
+# AI corrections
+_SYSTEM_PROMPTS = {
+    "text": "You are a document correction assistant. Fix errors in text content while preserving markdown formatting.",
+    "table": "You are a table correction assistant. Fix errors in YAML-formatted tables while preserving structure.",
+    "image_text": "You are a document correction assistant. Fix errors in text extracted from images.",
+    "diagram": "You are a diagram correction assistant. Fix errors in Mermaid diagram syntax.",
+    "form": "You are a form correction assistant. Fix errors in YAML-formatted form data.",
+    "mixed": "You are a document correction assistant. Fix errors in mixed content (text, tables, etc)."
+}
+_DEFAULT_SYSTEM_PROMPT = _SYSTEM_PROMPTS["text"]
+
+# Part of every AI response cache key; bump when prompts change so that
+# earlier cached responses are no longer used
+AI_CACHE_VERSION = 1
+
+# Thread pool size for reading every entity's content (per-entity file reads
+# are independent and I/O-bound)
+ENTITY_READ_WORKERS = 8
+
+
+def _json_dumps(obj, indent: bool = False) -> bytes:
+    """Serialize to UTF-8 JSON bytes (orjson when available)."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=(orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS) if indent else 0)
+    return json.dumps(obj, indent=2 if indent else None, ensure_ascii=False).encode('utf-8')
+
+
+def _json_loads(raw: bytes):
+    """Parse JSON bytes (orjson when available); raises ValueError on bad input."""
+    return orjson.loads(raw) if orjson is not None else json.loads(raw)
+
 
-@dataclass
+def _mkstemp_beside(path: Path) -> tuple[int, str]:
+    """Create a temp file next to path, with path's permissions (or 0o644)."""
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        mode = path.stat().st_mode & 0o777
+    except FileNotFoundError:
+        mode = 0o644
+    os.chmod(tmp_path, mode)
+    return fd, tmp_path
+
+
+def _atomic_write(path: Path, data: bytes) -> bool:
+    """
+    Replace path with data via a temp file and os.replace, so readers never
+    see a partially written file. Skips the write if the bytes are unchanged.
+
+    Returns:
+        True if the file was written
+    """
+    try:
+        if path.stat().st_size == len(data) and path.read_bytes() == data:
+            return False
+    except FileNotFoundError:
+        pass
+
+    fd, tmp_path = _mkstemp_beside(path)
+    try:
+        with open(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+    return True
+
+
+@contextmanager
+def _atomic_text_writer(path: Path, buffering: int = -1):
+    """
+    Yield a text file handle whose contents atomically replace path on a
+    clean exit. An unchanged result leaves path (and its mtime) untouched.
+    """
+    fd, tmp_path = _mkstemp_beside(path)
+    try:
+        with open(fd, 'w', encoding='utf-8', buffering=buffering) as f:
+            yield f
+        if path.exists() and filecmp.cmp(tmp_path, path, shallow=False):
+            os.unlink(tmp_path)
+        else:
+            os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+
+@dataclass(slots=True, frozen=True)
 class CorrectionEntry:
     """Represents a single entity correction"""
     entity_id: str
@@ -33,7 +227,7 @@ class CorrectionEntry:
 class CorrectionManager:
     """Manages document corrections with audit trail"""
 
-    def __init__(self, output_dir: Path, html_path: Path = None):
+    def __init__(self, output_dir: Path, html_path: Path = None, http_client=None):
         """
         Initialize CorrectionManager
 
@@ -41,19 +235,69 @@ class CorrectionManager:
             output_dir: Path to output directory (e.g., p86_90/)
             html_path: Path to the HTML file being viewed (used to determine
                        which source markdown to read entity content from)
+            http_client: Optional shared httpx.AsyncClient for OpenAI calls,
+                         so connections stay alive across AI corrections
         """
         self.output_dir = Path(output_dir)
+        self.http_client = http_client
+        self._openai_client = None
+        # One corrections/<entity_id>.yaml file per corrected entity, so a
+        # correction writes only its own record. corrections.yaml is the
+        # legacy single-file store, still read but no longer written.
+        self.corrections_dir = self.output_dir / "corrections"
         self.corrections_path = self.output_dir / "corrections.yaml"
+        self._corrections_cache = None
+        self._corrections_key = None
         self.manifest_path = self.output_dir / "manifest.yaml"
         self.entities_dir = self.output_dir / "entities"
 
+        # On-disk cache of AI responses, loaded on first use
+        self._ai_cache_path = self.output_dir / "ai_correction_cache.json"
+        self._ai_cache: dict | None = None
+
+        # Rendered final_document.md block per entity, keyed on the entity
+        # file's stat and marker fields, so a rebuild only re-reads entity
+        # files that changed. Persisted between runs.
+        self._fragment_cache_path = self.output_dir / ".fragment_cache.json"
+        self._fragment_cache: dict | None = None
+
+        # (mtime_ns, size) of final_document.md as last rebuilt or patched by
+        # this manager; while it matches, the file is in sync with the entity
+        # files and regenerate_html can skip the full rebuild
+        self._final_doc_key = None
+
         # Determine the active source markdown based on the HTML being viewed.
         # If viewing final_document_judge_friendly.html, use final_document_judge.md.
         # Otherwise use final_document.md.
         self.active_md_path = self._resolve_active_md(html_path)
 
-        # Cache for parsed entity content from the active markdown
-        self._md_entity_cache = None
+        # Whether we're working with a judge-processed document (fixed for
+        # the lifetime of the manager, like active_md_path)
+        self.is_judge_mode = self.active_md_path is not None and 'judge' in self.active_md_path.name
+
+        # Raw bytes of the active markdown and an entity_id ->
+        # (content_start, content_end) byte-offset index into them, keyed on
+        # the file's (mtime_ns, size)
+        self._md_bytes: bytes | None = None
+        self._md_entity_cache: dict[str, tuple[int, int]] | None = None
+        self._md_cache_key = None
+
+        # Cache for the parsed manifest, keyed on the file's (mtime_ns, size),
+        # plus an entity id -> manifest entry index built from it and each
+        # entity's type normalized once as (lowercase, marker) strings, e.g.
+        # ("text", "TEXT"). Kept out of the entries so they are not dumped.
+        self._manifest_cache = None
+        self._manifest_key = None
+        self._entity_index: dict[str, dict] = {}
+        self._entity_types: dict[str, tuple[str, str]] = {}
+        self._manifest_lock = threading.Lock()
+        # Whether manifest.yaml was last read as JSON (see _flush_manifest)
+        self._manifest_is_json = False
+
+        # Correction flags are applied to the cached manifest and written out
+        # by _flush_manifest(): at the end of each correction or batch, or,
+        # for callers that defer it, before HTML regeneration
+        self._manifest_dirty = False
 
         # Validate paths
         if not self.output_dir.exists():
@@ -99,45 +343,72 @@ class CorrectionManager:
         if self.active_md_path is None or not self.active_md_path.exists():
             return None
 
-        # Use cache if available
-        if self._md_entity_cache is None:
-            self._md_entity_cache = self._parse_md_entity_blocks()
-
-        return self._md_entity_cache.get(entity_id)
-
-    def _parse_md_entity_blocks(self) -> dict[str, str]:
+        entry = self._get_md_entity_index().get(entity_id)
+        if entry is None:
+            return None
+        content_start, content_end = entry
+        return self._md_bytes[content_start:content_end].decode('utf-8').strip()
+
+    def _md_stat_key(self) -> tuple[int, int]:
+        st = self.active_md_path.stat()
+        return (st.st_mtime_ns, st.st_size)
+
+    def _get_md_entity_index(self) -> dict[str, tuple[int, int]]:
+        """Return the marker index of the active markdown, re-reading it if the file changed."""
+        key = self._md_stat_key()
+        if self._md_entity_cache is None or key != self._md_cache_key:
+            self._md_bytes = self.active_md_path.read_bytes()
+            self._md_entity_cache = self._parse_md_entity_blocks(self._md_bytes)
+            self._md_cache_key = key
+        return self._md_entity_cache
+
+    @staticmethod
+    def _parse_md_entity_blocks(content: bytes) -> dict[str, tuple[int, int]]:
         """
-        Parse the active markdown file into a dict of entity_id -> content.
+        Parse markdown bytes into a dict of entity_id -> (content_start, content_end).
 
-        Splits on entity marker comments and extracts content between them.
+        Splits on entity marker comments. The byte offsets delimit the raw
+        region after each marker (excluding any trailing judge change log),
+        so content can be sliced and updates spliced without re-scanning.
         """
-        content = self.active_md_path.read_text(encoding='utf-8')
-        entity_pattern = r'<!-- Entity: (E\d+) \| Type: .*? \| Page: \d+ -->'
-
-        # Find all entity markers and their positions
-        markers = list(re.finditer(entity_pattern, content))
-
-        if not markers:
-            return {}
-
-        entities = {}
-        for i, match in enumerate(markers):
-            entity_id = match.group(1)
-            content_start = match.end()
-            content_end = markers[i + 1].start() if i + 1 < len(markers) else len(content)
-            block = content[content_start:content_end].strip()
+        # Each block runs from the end of its marker to the start of the next
+        markers = list(_ENTITY_MARKER_RE.finditer(content))
+        ends = [match.start() for match in markers[1:]]
+        ends.append(len(content))
+
+        entities = {
+            match.group(1).decode('ascii'): (match.end(), end)
+            for match, end in zip(markers, ends)
+        }
 
-            # Strip trailing judge change log if present
-            changelog_match = re.search(r'\n---\s*\n# Judge Change Log', block)
+        # The judge change log can only trail the final block
+        if markers:
+            last_id = markers[-1].group(1).decode('ascii')
+            content_start, content_end = entities[last_id]
+            changelog_match = _CHANGELOG_RE.search(content, content_start, content_end)
             if changelog_match:
-                block = block[:changelog_match.start()].strip()
-
-            entities[entity_id] = block
+                entities[last_id] = (content_start, changelog_match.start())
 
         return entities
 
+    def source_md_mtime_ns(self) -> int | None:
+        """Modification time (ns) of the active source markdown, None if absent."""
+        if self.active_md_path is None:
+            return None
+        try:
+            return self.active_md_path.stat().st_mtime_ns
+        except FileNotFoundError:
+            return None
+
     def invalidate_cache(self):
-        """Invalidate the parsed markdown cache (call after corrections)."""
+        """
+        Drop the parsed markdown cache.
+
+        Not needed after corrections: updates patch the index in place and
+        external rewrites are detected from the file's mtime/size. Kept as a
+        manual reset.
+        """
+        self._md_bytes = None
         self._md_entity_cache = None
 
     def _load_manifest(self) -> dict:
@@ -148,44 +419,130 @@ class CorrectionManager:
             Dictionary with manifest data
         """
         try:
-            with open(self.manifest_path, 'r', encoding='utf-8') as f:
-                # Use yaml.Loader to handle EntityType enums
-                manifest = yaml.load(f, Loader=yaml.Loader)
-                return manifest if manifest else {}
+            # One read of the whole file; the loader detects the UTF-8 encoding.
+            # ManifestLoader handles EntityType enums. Manifests the pipeline
+            # wrote as JSON (when orjson is installed) skip the YAML parser.
+            raw = self.manifest_path.read_bytes()
+            self._manifest_is_json = raw[:1] == b'{'
+            if self._manifest_is_json:
+                manifest = _json_loads(raw)
+            else:
+                manifest = yaml.load(raw, Loader=ManifestLoader)
+            return manifest if manifest else {}
         except Exception as e:
             print(f"Warning: Could not load manifest: {e}")
             return {}
 
+    def _manifest_stat_key(self) -> tuple[int, int]:
+        """Identify the on-disk version of manifest.yaml by (mtime_ns, size)."""
+        st = self.manifest_path.stat()
+        return (st.st_mtime_ns, st.st_size)
+
+    def _get_manifest(self) -> dict:
+        """
+        Return the parsed manifest, re-parsing only when the file changed.
+
+        Also refreshes self._entity_index and self._entity_types. Index values are the same dicts
+        as in manifest['entities'], so in-place updates are persisted by the
+        next manifest dump. Unflushed updates are never discarded by a reload.
+        """
+        with self._manifest_lock:
+            if self._manifest_dirty:
+                return self._manifest_cache
+            key = self._manifest_stat_key()
+            if self._manifest_cache is None or key != self._manifest_key:
+                manifest = self._load_manifest()
+                self._entity_index = {e['id']: e for e in manifest.get('entities', [])}
+                self._entity_types = {
+                    e['id']: self._normalize_entity_type(e['type'])
+                    for e in manifest.get('entities', [])
+                }
+                self._manifest_cache = manifest
+                self._manifest_key = key
+            return self._manifest_cache
+
+    def get_manifest(self) -> dict:
+        """Return the parsed manifest (shared, cached; treat as read-only)."""
+        return self._get_manifest()
+
     def load_corrections(self) -> dict:
         """
-        Load existing corrections from corrections.yaml
+        Load existing corrections from corrections/ (and legacy corrections.yaml)
+
+        The merged result is cached until the directory or legacy file changes;
+        treat it as read-only.
 
         Returns:
             Dictionary of corrections by entity ID
         """
-        if not self.corrections_path.exists():
-            return {"corrections": {}}
+        key = self._corrections_stat_key()
+        if self._corrections_cache is not None and key == self._corrections_key:
+            return self._corrections_cache
 
-        try:
-            with open(self.corrections_path, 'r', encoding='utf-8') as f:
-                data = yaml.safe_load(f)
-                return data if data else {"corrections": {}}
-        except Exception as e:
-            print(f"Warning: Could not load corrections: {e}")
-            return {"corrections": {}}
+        corrections = {}
 
-    def save_correction(self, correction: CorrectionEntry) -> None:
+        # Legacy single-file store; sidecar records take precedence
+        if self.corrections_path.exists():
+            try:
+                raw = self.corrections_path.read_bytes()
+                try:
+                    data = _json_loads(raw)
+                except ValueError:
+                    # Legacy corrections.yaml written as block-style YAML
+                    data = yaml.load(raw, Loader=_SafeLoader)
+                corrections.update((data or {}).get('corrections') or {})
+            except Exception as e:
+                print(f"Warning: Could not load corrections: {e}")
+
+        if self.corrections_dir.is_dir():
+            for path in sorted(self.corrections_dir.glob('*.yaml')):
+                try:
+                    corrections[path.stem] = _json_loads(path.read_bytes())
+                except Exception as e:
+                    print(f"Warning: Could not load correction {path.name}: {e}")
+
+        self._corrections_cache = {"corrections": corrections}
+        self._corrections_key = key
+        return self._corrections_cache
+
+    def _corrections_stat_key(self) -> tuple:
+        """Change key for the corrections store: stats of corrections.yaml and corrections/."""
+        def stat_key(path: Path):
+            try:
+                st = path.stat()
+            except FileNotFoundError:
+                return None
+            return (st.st_mtime_ns, st.st_size)
+
+        # Sidecars are written via rename, which always bumps the directory mtime
+        return (stat_key(self.corrections_path), stat_key(self.corrections_dir))
+
+    def save_correction(self, correction: CorrectionEntry, corrections_data: dict = None) -> dict:
         """
-        Save a single correction to corrections.yaml
+        Save a single correction to corrections/<entity_id>.yaml
+
+        When corrections_data is given, the entry is added to that in-memory
+        dict and nothing is written. Otherwise the entity's record file is
+        written and the merged corrections are returned.
 
         Args:
             correction: CorrectionEntry to save
+            corrections_data: Optional in-memory corrections (from load_corrections())
+
+        Returns:
+            The updated corrections dict
         """
-        # Load existing corrections
-        corrections_data = self.load_corrections()
+        record = self._correction_record(correction)
+        if corrections_data is not None:
+            corrections_data["corrections"][correction.entity_id] = record
+            return corrections_data
 
-        # Add new correction
-        corrections_data["corrections"][correction.entity_id] = {
+        self._write_correction_records({correction.entity_id: record})
+        return self.load_corrections()
+
+    @staticmethod
+    def _correction_record(correction: CorrectionEntry) -> dict:
+        record = {
             "correction_type": correction.correction_type,
             "timestamp": correction.timestamp,
             "reason": correction.reason,
@@ -195,11 +552,36 @@ class CorrectionManager:
 
         # Add user_prompt if AI correction
         if correction.user_prompt:
-            corrections_data["corrections"][correction.entity_id]["user_prompt"] = correction.user_prompt
+            record["user_prompt"] = correction.user_prompt
+
+        return record
 
-        # Write to file
-        with open(self.corrections_path, 'w', encoding='utf-8') as f:
-            yaml.dump(corrections_data, f, default_flow_style=False, allow_unicode=True)
+    def _save_corrections(self, corrections: list[CorrectionEntry]) -> None:
+        """Record several corrections, one sidecar file each."""
+        self._write_correction_records({
+            correction.entity_id: self._correction_record(correction) for correction in corrections
+        })
+
+    def _write_correction_records(self, records: dict[str, dict]) -> None:
+        """
+        Write correction records to corrections/<entity_id>.yaml.
+
+        Each file holds one record as indented JSON, which is still valid YAML
+        for anything reading it as such.
+        """
+        cache_fresh = (
+            self._corrections_cache is not None
+            and self._corrections_stat_key() == self._corrections_key
+        )
+
+        self.corrections_dir.mkdir(exist_ok=True)
+        for entity_id, record in records.items():
+            _atomic_write(self.corrections_dir / f"{entity_id}.yaml", _json_dumps(record, indent=True))
+
+        # Keep an up-to-date cache current instead of re-reading every record
+        if cache_fresh:
+            self._corrections_cache["corrections"].update(records)
+            self._corrections_key = self._corrections_stat_key()
 
     def get_entity_content(self, entity_id: str) -> dict:
         """
@@ -210,49 +592,37 @@ class CorrectionManager:
 
         Returns:
             Dictionary with entity_id, type, page, content, metadata
-        """
-        # Load manifest to get entity metadata
-        # Use Loader=yaml.Loader to handle Python object tags (EntityType enums)
-        with open(self.manifest_path, 'r', encoding='utf-8') as f:
-            manifest = yaml.load(f, Loader=yaml.Loader)
 
-        # Find entity in manifest
-        entity_info = None
-        for entity in manifest.get('entities', []):
-            if entity['id'] == entity_id:
-                entity_info = entity
-                break
+        Raises:
+            ValueError: If the entity is not in the manifest
+            KeyError: In judge mode, if the entity is not in the judge markdown
+        """
+        # Look up entity metadata in the cached manifest
+        self._get_manifest()
+        entity_info = self._entity_index.get(entity_id)
 
         if not entity_info:
             raise ValueError(f"Entity {entity_id} not found in manifest")
 
         # Try to get content from the active markdown document first.
         # This reflects any judge merges (where multiple entities were
-        # combined into one). Falls back to original entity files.
+        # combined into one). Falls back to original entity files, except
+        # in judge mode where the judge markdown is authoritative.
         content = self._get_md_entity_content(entity_id)
 
         if content is None:
+            if self.is_judge_mode:
+                raise KeyError(f"{entity_id} missing from {self.active_md_path.name}")
+
             # Fallback: read from original entity file
             entity_file = self.output_dir / entity_info['file']
             if not entity_file.exists():
                 raise FileNotFoundError(f"Entity file not found: {entity_file}")
-            content = self._read_entity_file(entity_file)
-
-        # Convert EntityType enum to string if needed
-        entity_type = entity_info['type']
-        if hasattr(entity_type, 'name'):
-            # It's an enum, get the string name
-            entity_type = entity_type.name.lower()
-        elif hasattr(entity_type, 'value'):
-            # It's an enum with value
-            entity_type = str(entity_type.value).lower()
-        else:
-            # Already a string
-            entity_type = str(entity_type).lower()
+            content = self._read_entity_file(entity_file, entity_file.suffix)
 
         return {
             "entity_id": entity_id,
-            "type": entity_type,
+            "type": self._entity_types[entity_id][0],
             "page": entity_info['page'],
             "content": content,
             "metadata": {
@@ -262,41 +632,46 @@ class CorrectionManager:
             }
         }
 
-    def _read_entity_file(self, file_path: Path) -> str:
+    def _read_entity_file(self, file_path: Path, ext: Optional[str] = None) -> str:
         """
         Read entity content from file, stripping frontmatter
 
         Args:
             file_path: Path to entity file
+            ext: File extension, if already known (defaults to file_path.suffix)
 
         Returns:
             Entity content without frontmatter
         """
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-
-        # Strip frontmatter (YAML/Markdown format: ---\nfrontmatter\n---\ncontent)
+        if ext is None:
+            ext = file_path.suffix
+
+        # Read and decode in one go rather than through a text-mode file,
+        # keeping text mode's newline translation
+        content = file_path.read_bytes().decode('utf-8')
+        if '\r' in content:
+            content = content.replace('\r\n', '\n').replace('\r', '\n')
+
+        # YAML/Mermaid format: leading comment lines (# or %%), then content.
+        # Content starting with anything but a comment or whitespace has no
+        # frontmatter, so skip the regex scan.
+        first = content[:1]
+        if ext in ('.yaml', '.yml'):
+            if first != '#' and not first.isspace():
+                return content.strip()
+            body = _YAML_BODY_RE.search(content)
+            return content[body.start():].strip() if body else ''
+        if ext == '.mmd':
+            if first != '%' and not first.isspace():
+                return content.strip()
+            body = _MMD_BODY_RE.search(content)
+            return content[body.start():].strip() if body else ''
+
+        # Markdown format: ---\nfrontmatter\n---\ncontent
         if content.startswith('---'):
-            parts = content.split('---', 2)
-            if len(parts) >= 3:
-                return parts[2].strip()
-
-        # Strip frontmatter (YAML/Mermaid format: # Metadata\n# ...\n\ncontent)
-        if content.startswith('# Metadata') or content.startswith('# entity_id'):
-            lines = content.split('\n')
-            content_lines = []
-            in_frontmatter = True
-
-            for line in lines:
-                if in_frontmatter and line.startswith('#'):
-                    continue
-                elif in_frontmatter and line.strip() == '':
-                    in_frontmatter = False
-                    continue
-                else:
-                    content_lines.append(line)
-
-            return '\n'.join(content_lines).strip()
+            end = content.find('---', 3)
+            if end != -1:
+                return content[end + 3:].strip()
 
         # No frontmatter found, return as-is
         return content.strip()
@@ -311,69 +686,23 @@ class CorrectionManager:
             new_content: New entity content
         """
         # Determine file format based on extension
-        ext = file_path.suffix
-
-        if ext in ['.md']:
-            # Markdown format with YAML frontmatter
-            frontmatter = f"""---
-entity_id: {entity_info['entity_id']}
-type: {entity_info['type']}
-source_page: {entity_info['page']}
-position: {entity_info['metadata']['position']}
-confidence: {entity_info['metadata'].get('confidence', 'null')}
-corrected: true
-correction_timestamp: {datetime.now().isoformat()}
----
-
-{new_content}
-"""
-        elif ext in ['.yaml', '.yml']:
-            # YAML format with commented metadata
-            frontmatter = f"""# Metadata
-# entity_id: {entity_info['entity_id']}
-# type: {entity_info['type']}
-# source_page: {entity_info['page']}
-# position: {entity_info['metadata']['position']}
-# confidence: {entity_info['metadata'].get('confidence', 'null')}
-# corrected: true
-# correction_timestamp: {datetime.now().isoformat()}
-
-{new_content}
-"""
-        elif ext in ['.mmd']:
-            # Mermaid format with commented metadata
-            frontmatter = f"""%% Metadata
-%% entity_id: {entity_info['entity_id']}
-%% type: {entity_info['type']}
-%% source_page: {entity_info['page']}
-%% position: {entity_info['metadata']['position']}
-%% confidence: {entity_info['metadata'].get('confidence', 'null')}
-%% corrected: true
-%% correction_timestamp: {datetime.now().isoformat()}
-
-{new_content}
-"""
-        else:
-            # Unknown format, write with markdown frontmatter
-            frontmatter = f"""---
-entity_id: {entity_info['entity_id']}
-type: {entity_info['type']}
-corrected: true
----
-
-{new_content}
-"""
-
-        # Write to file
-        with open(file_path, 'w', encoding='utf-8') as f:
-            f.write(frontmatter)
-
-    @property
-    def is_judge_mode(self) -> bool:
-        """Check if we're working with a judge-processed document."""
-        if self.active_md_path is None:
-            return False
-        return 'judge' in self.active_md_path.name
+        template = _ENTITY_FILE_TEMPLATES.get(file_path.suffix, _ENTITY_FILE_TEMPLATE_MINIMAL)
+        frontmatter = template.format_map({
+            'entity_id': entity_info['entity_id'],
+            'type': entity_info['type'],
+            'page': entity_info['page'],
+            'position': entity_info['metadata']['position'],
+            'confidence': entity_info['metadata'].get('confidence', 'null'),
+            'timestamp': datetime.now().isoformat(),
+            'content': new_content,
+        })
+
+        # Write to file (atomically, so a crash never leaves a truncated entity)
+        _atomic_write(file_path, frontmatter.encode('utf-8'))
+
+        # Never trust a cached fragment for a file we just rewrote
+        if self._fragment_cache is not None:
+            self._fragment_cache.pop(entity_info['entity_id'], None)
 
     def _update_md_entity_content(self, entity_id: str, new_content: str) -> None:
         """
@@ -382,40 +711,65 @@ corrected: true
         Replaces the content block for entity_id between its marker and
         the next entity marker (or end of file).
         """
-        if self.active_md_path is None or not self.active_md_path.exists():
-            raise FileNotFoundError(f"Active markdown not found: {self.active_md_path}")
-
-        md_content = self.active_md_path.read_text(encoding='utf-8')
-        entity_pattern = r'<!-- Entity: (E\d+) \| Type: .*? \| Page: \d+ -->'
-
-        markers = list(re.finditer(entity_pattern, md_content))
-
-        # Find the marker for our entity
-        target_idx = None
-        for i, match in enumerate(markers):
-            if match.group(1) == entity_id:
-                target_idx = i
-                break
+        self._update_md_entities({entity_id: new_content})
+        print(f"✓ Updated {entity_id} in {self.active_md_path.name}")
 
-        if target_idx is None:
-            raise ValueError(f"Entity {entity_id} not found in {self.active_md_path.name}")
+    def _update_md_entities(self, updates: dict[str, str]) -> None:
+        """
+        Replace the content blocks of several entities in the active markdown
+        with a single read and a single write.
 
-        # Determine the content region to replace
-        marker = markers[target_idx]
-        content_start = marker.end()
-        content_end = markers[target_idx + 1].start() if target_idx + 1 < len(markers) else len(md_content)
+        Args:
+            updates: Mapping of entity_id -> new content
+        """
+        if self.active_md_path is None or not self.active_md_path.exists():
+            raise FileNotFoundError(f"Active markdown not found: {self.active_md_path}")
 
-        # Check if the tail has the judge change log (only for last entity)
-        tail = md_content[content_start:content_end]
-        changelog_match = re.search(r'\n---\s*\n# Judge Change Log', tail)
-        if changelog_match:
-            content_end = content_start + changelog_match.start()
+        index = self._get_md_entity_index()
+        for entity_id in updates:
+            if entity_id not in index:
+                raise ValueError(f"Entity {entity_id} not found in {self.active_md_path.name}")
 
-        # Replace the content block, preserving surrounding whitespace
-        updated = md_content[:content_start] + f"\n\n{new_content}\n\n" + md_content[content_end:]
+        self._splice_md_entities({
+            entity_id: b"\n\n" + new_content.encode('utf-8') + b"\n\n"
+            for entity_id, new_content in updates.items()
+        })
 
-        self.active_md_path.write_text(updated, encoding='utf-8')
-        print(f"✓ Updated {entity_id} in {self.active_md_path.name}")
+    def _splice_md_entities(self, replacements: dict[str, bytes]) -> None:
+        """
+        Replace the raw regions after the given entities' markers in the
+        active markdown, write it atomically and patch the offset index.
+        All entity IDs must be present in the index.
+        """
+        index = self._md_entity_cache
+        md_bytes = self._md_bytes
+
+        # Splice all replacements in one forward pass over the cached byte
+        # offsets, preserving surrounding whitespace
+        parts = []
+        pos = 0
+        for entity_id in sorted(replacements, key=lambda eid: index[eid][0]):
+            content_start, content_end = index[entity_id]
+            parts.append(md_bytes[pos:content_start])
+            parts.append(replacements[entity_id])
+            pos = content_end
+        parts.append(md_bytes[pos:])
+        updated = b"".join(parts)
+
+        _atomic_write(self.active_md_path, updated)
+
+        # Patch the index in place: updated entities get their new extent,
+        # later offsets are shifted
+        delta = 0
+        for entity_id, (start, end) in sorted(index.items(), key=lambda item: item[1][0]):
+            if entity_id in replacements:
+                replacement_len = len(replacements[entity_id])
+                index[entity_id] = (start + delta, start + delta + replacement_len)
+                delta += replacement_len - (end - start)
+            elif delta:
+                index[entity_id] = (start + delta, end + delta)
+        self._md_bytes = updated
+        self._md_cache_key = self._md_stat_key()
 
     def apply_correction(
         self,
@@ -423,7 +777,8 @@ corrected: true
         corrected_content: str,
         correction_type: Literal["manual", "ai"],
         reason: str,
-        user_prompt: Optional[str] = None
+        user_prompt: Optional[str] = None,
+        flush_manifest: bool = True
     ) -> None:
         """
         Apply correction to entity file and update manifest
@@ -434,6 +789,8 @@ corrected: true
             correction_type: "manual" or "ai"
             reason: Reason for correction
             user_prompt: User prompt (for AI corrections)
+            flush_manifest: Write manifest.yaml now; pass False only when
+                            regenerate_html() is about to run, which flushes it
         """
         # Get entity data
         entity_data = self.get_entity_content(entity_id)
@@ -461,36 +818,172 @@ corrected: true
             # In regular mode: update the individual entity file
             entity_file = self.output_dir / entity_data['metadata']['file']
             self._write_entity_file(entity_file, entity_data, corrected_content)
+            self._patch_final_document([entity_id])
 
         # Update manifest with correction metadata
         self._update_manifest_correction(entity_id, correction)
+        if flush_manifest:
+            self._flush_manifest()
 
         print(f"✓ Correction applied to {entity_id}")
 
+    def apply_corrections_batch(
+        self,
+        corrections: list[dict],
+        correction_type: Literal["manual", "ai"] = "manual",
+        user_prompt: Optional[str] = None
+    ) -> list[str]:
+        """
+        Apply several corrections, writing manifest.yaml and (in judge mode)
+        the active markdown once each
+
+        Args:
+            corrections: List of dicts with 'entity_id', 'corrected_content' and
+                         'reason', optionally overriding 'correction_type' and
+                         'user_prompt' per item
+            correction_type: Default "manual" or "ai"
+            user_prompt: Default user prompt (for AI corrections)
+
+        Returns:
+            List of entity IDs that were corrected
+        """
+        timestamp = datetime.now().isoformat()
+        entries = []
+        entity_data_by_id = {}
+
+        for correction in corrections:
+            entity_id = correction['entity_id']
+            try:
+                entity_data = self.get_entity_content(entity_id)
+            except Exception as e:
+                print(f"Warning: Failed to apply correction to {entity_id}: {e}")
+                continue
+
+            entity_data_by_id[entity_id] = entity_data
+            entries.append(CorrectionEntry(
+                entity_id=entity_id,
+                correction_type=correction.get('correction_type', correction_type),
+                original_content=entity_data['content'],
+                corrected_content=correction['corrected_content'],
+                reason=correction['reason'],
+                timestamp=timestamp,
+                user_prompt=correction.get('user_prompt', user_prompt)
+            ))
+
+        if self.is_judge_mode:
+            index = self._get_md_entity_index()
+            missing = [entry.entity_id for entry in entries if entry.entity_id not in index]
+            for entity_id in missing:
+                print(f"Warning: Failed to apply correction to {entity_id}: "
+                      f"not found in {self.active_md_path.name}")
+            entries = [entry for entry in entries if entry.entity_id in index]
+
+            # One read/splice/write of the judge markdown for all entities
+            self._update_md_entities({entry.entity_id: entry.corrected_content for entry in entries})
+        else:
+            applied = []
+            for entry in entries:
+                entity_data = entity_data_by_id[entry.entity_id]
+                entity_file = self.output_dir / entity_data['metadata']['file']
+                try:
+                    self._write_entity_file(entity_file, entity_data, entry.corrected_content)
+                except Exception as e:
+                    print(f"Warning: Failed to apply correction to {entry.entity_id}: {e}")
+                    continue
+                applied.append(entry)
+            entries = applied
+            self._patch_final_document([entry.entity_id for entry in entries])
+
+        if entries:
+            self._save_corrections(entries)
+            self._update_manifest_corrections(entries)
+            self._flush_manifest()
+
+        print(f"✓ Applied {len(entries)} corrections")
+        return [entry.entity_id for entry in entries]
+
+    def apply_corrections(
+        self,
+        items: list[tuple[str, str, Literal["manual", "ai"], str, Optional[str]]]
+    ) -> tuple[list[str], Path]:
+        """
+        Apply several corrections and regenerate the HTML once
+
+        Args:
+            items: (entity_id, corrected_content, correction_type, reason, user_prompt) tuples
+
+        Returns:
+            (IDs of the corrected entities, path to the regenerated HTML)
+        """
+        applied = self.apply_corrections_batch([
+            {
+                'entity_id': entity_id,
+                'corrected_content': corrected_content,
+                'correction_type': correction_type,
+                'reason': reason,
+                'user_prompt': user_prompt,
+            }
+            for entity_id, corrected_content, correction_type, reason, user_prompt in items
+        ])
+        html_path, _ = self.regenerate_html()
+        return applied, html_path
+
     def _update_manifest_correction(self, entity_id: str, correction: CorrectionEntry) -> None:
         """
-        Update manifest.yaml with correction metadata
+        Record correction metadata in the manifest
 
         Args:
             entity_id: Entity ID
             correction: CorrectionEntry
         """
-        # Load manifest
-        # Use Loader=yaml.Loader to handle Python object tags (EntityType enums)
-        with open(self.manifest_path, 'r', encoding='utf-8') as f:
-            manifest = yaml.load(f, Loader=yaml.Loader)
+        self._update_manifest_corrections([correction])
 
-        # Find and update entity
-        for entity in manifest.get('entities', []):
-            if entity['id'] == entity_id:
+    def _update_manifest_corrections(self, corrections: list[CorrectionEntry]) -> None:
+        """
+        Flag entities as corrected in the cached manifest. The change is
+        written to manifest.yaml by the next _flush_manifest().
+        """
+        self._get_manifest()
+
+        # Resolve every entity before mutating anything
+        entities = []
+        for correction in corrections:
+            entity = self._entity_index.get(correction.entity_id)
+            if entity is None:
+                raise ValueError(f"Entity {correction.entity_id} not found in manifest")
+            entities.append((entity, correction))
+
+        # Update entities in place (index entries alias manifest['entities'])
+        with self._manifest_lock:
+            for entity, correction in entities:
                 entity['corrected'] = True
                 entity['correction_timestamp'] = correction.timestamp
                 entity['correction_type'] = correction.correction_type
-                break
 
-        # Write updated manifest
-        with open(self.manifest_path, 'w', encoding='utf-8') as f:
-            yaml.dump(manifest, f, default_flow_style=False, allow_unicode=True)
+            self._manifest_dirty = True
+
+    def _flush_manifest(self) -> None:
+        """
+        Write the cached manifest to manifest.yaml if it has unflushed updates,
+        in the pipeline's format: indented JSON when orjson is installed or the
+        file already is JSON, otherwise YAML, keeping key order either way.
+        """
+        with self._manifest_lock:
+            if not self._manifest_dirty:
+                return
+
+            if orjson is not None or self._manifest_is_json:
+                data = _json_dumps(self._manifest_cache, indent=True) + b"\n"
+            else:
+                data = yaml.dump(
+                    self._manifest_cache, Dumper=ManifestDumper, default_flow_style=False,
+                    sort_keys=False, allow_unicode=True, encoding='utf-8'
+                )
+            _atomic_write(self.manifest_path, data)
+
+            # The cache already holds this update; just record the new file version
+            self._manifest_key = self._manifest_stat_key()
+            self._manifest_dirty = False
 
     def _rebuild_final_document(self) -> Path:
         """
@@ -500,58 +993,140 @@ corrected: true
             Path to rebuilt final_document.md
         """
         # Load manifest to get entity order
-        with open(self.manifest_path, 'r', encoding='utf-8') as f:
-            manifest = yaml.load(f, Loader=yaml.Loader)
+        manifest = self._get_manifest()
+        entity_types = self._entity_types
 
         final_doc_path = self.output_dir / "final_document.md"
 
-        # Build final document from entities
-        content_parts = []
+        cache = self._get_fragment_cache()
+        fragments = {}
+
+        # Stream each entity block to a temp file instead of joining the whole
+        # document in memory, then swap it in atomically
+        with _atomic_text_writer(final_doc_path, buffering=1 << 20) as f:
+            write = f.write
+            for i, entity in enumerate(manifest.get('entities', [])):
+                entity_id = entity['id']
+                entity_type_str = entity_types[entity_id][1]
+                entity_page = entity['page']
+                entity_file = self.output_dir / entity['file']
+
+                st = entity_file.stat()
+                key = [FRAGMENT_CACHE_VERSION, entity['file'], st.st_mtime_ns, st.st_size, entity_type_str, entity_page]
+                cached = cache.get(entity_id)
+                if cached is not None and cached[0] == key:
+                    fragment = cached[1]
+                else:
+                    fragment = self._render_fragment(entity_id, entity_type_str, entity_page, entity_file)
+                fragments[entity_id] = [key, fragment]
 
-        for entity in manifest.get('entities', []):
-            entity_id = entity['id']
-            entity_type = entity['type']
-            entity_page = entity['page']
-            entity_file = self.output_dir / entity['file']
+                # Blank line between entity blocks
+                if i:
+                    write("\n")
+                write(fragment)
 
-            # Convert enum to string if needed
-            if hasattr(entity_type, 'name'):
-                entity_type_str = entity_type.name
-            else:
-                entity_type_str = str(entity_type).upper()
-
-            # Read entity content (with frontmatter stripped)
-            entity_content = self._read_entity_file(entity_file)
-
-            # Add entity marker comment
-            content_parts.append(f"<!-- Entity: {entity_id} | Type: {entity_type_str} | Page: {entity_page} -->")
-            content_parts.append("")
-
-            # Wrap content based on type
-            file_ext = entity_file.suffix
-            if file_ext == '.yaml':
-                content_parts.append("```yaml")
-                content_parts.append(entity_content)
-                content_parts.append("```")
-            elif file_ext == '.mmd':
-                content_parts.append("```mermaid")
-                content_parts.append(entity_content)
-                content_parts.append("```")
-            else:
-                # Markdown content - add directly
-                content_parts.append(entity_content)
+        if fragments != cache:
+            self._fragment_cache = fragments
+            _atomic_write(self._fragment_cache_path, _json_dumps(fragments))
 
-            content_parts.append("")
-
-        # Write rebuilt final_document.md
-        final_content = "\n".join(content_parts)
-        with open(final_doc_path, 'w', encoding='utf-8') as f:
-            f.write(final_content)
+        st = final_doc_path.stat()
+        self._final_doc_key = (st.st_mtime_ns, st.st_size)
 
         print(f"✓ Rebuilt final_document.md from entity files")
         return final_doc_path
 
-    def regenerate_html(self) -> Path:
+    def _patch_final_document(self, entity_ids: list[str]) -> None:
+        """
+        Re-render the given entities' blocks of final_document.md in place
+        (regular mode), instead of rebuilding the whole document.
+
+        If a block cannot be patched, final_document.md is marked out of sync
+        and the next regenerate_html() rebuilds it from the entity files.
+        """
+        if not entity_ids:
+            return
+
+        final_doc_path = self.output_dir / "final_document.md"
+        if self.active_md_path != final_doc_path or not final_doc_path.exists():
+            self._final_doc_key = None
+            return
+
+        self._get_manifest()
+        index = self._get_md_entity_index()
+        was_synced = self._final_doc_key == self._md_cache_key
+        md_bytes = self._md_bytes
+
+        replacements = {}
+        for entity_id in entity_ids:
+            entity = self._entity_index.get(entity_id)
+            entry = index.get(entity_id)
+            if entity is None or entry is None:
+                self._final_doc_key = None
+                return
+
+            fragment = self._render_fragment(
+                entity_id, self._entity_types[entity_id][1], entity['page'],
+                self.output_dir / entity['file']
+            ).encode('utf-8')
+
+            # The marker must be unchanged; the block is everything after it,
+            # plus the blank line separating it from the next block
+            marker_end = fragment.index(b"-->") + 3
+            content_start, content_end = entry
+            if md_bytes[content_start - marker_end:content_start] != fragment[:marker_end]:
+                self._final_doc_key = None
+                return
+            replacements[entity_id] = fragment[marker_end:] + (b"\n" if content_end < len(md_bytes) else b"")
+
+        self._splice_md_entities(replacements)
+        self._final_doc_key = self._md_cache_key if was_synced else None
+
+    @staticmethod
+    def _normalize_entity_type(entity_type) -> tuple[str, str]:
+        """
+        Normalize a manifest entity type (EntityType or string) to
+        (lowercase name, name as written in final_document.md markers).
+        """
+        # Convert enum to string if needed
+        if hasattr(entity_type, 'name'):
+            marker = entity_type.name
+            return marker.lower(), marker
+        if hasattr(entity_type, 'value'):
+            marker = str(entity_type).upper()
+            return str(entity_type.value).lower(), marker
+        return str(entity_type).lower(), str(entity_type).upper()
+
+    def _render_fragment(self, entity_id: str, entity_type_str: str, entity_page, entity_file: Path) -> str:
+        """Render one entity's block of final_document.md (marker comment + content)."""
+        file_ext = entity_file.suffix
+
+        # Read entity content (with frontmatter stripped)
+        entity_content = self._read_entity_file(entity_file, file_ext)
+
+        # Add entity marker comment
+        marker = f"<!-- Entity: {entity_id} | Type: {entity_type_str} | Page: {entity_page} -->\n\n"
+
+        # Wrap content based on type
+        if file_ext == '.yaml':
+            return f"{marker}```yaml\n{entity_content}\n```\n"
+        elif file_ext == '.mmd':
+            return f"{marker}```mermaid\n{entity_content}\n```\n"
+        else:
+            # Markdown content - add directly
+            return f"{marker}{entity_content}\n"
+
+    def _get_fragment_cache(self) -> dict:
+        """Load .fragment_cache.json on first use."""
+        if self._fragment_cache is None:
+            self._fragment_cache = {}
+            if self._fragment_cache_path.exists():
+                try:
+                    self._fragment_cache = _json_loads(self._fragment_cache_path.read_bytes())
+                except Exception as e:
+                    print(f"Warning: Could not load fragment cache: {e}")
+        return self._fragment_cache
+
+    def regenerate_html(self) -> tuple[Path, bytes]:
         """
         Regenerate HTML using DocumentConverter.
 
@@ -559,24 +1134,84 @@ corrected: true
         In regular mode: rebuilds final_document.md from entity files first.
 
         Returns:
-            Path to regenerated HTML file
+            (path to regenerated HTML file, UTF-8 bytes written to it)
         """
         from ..converter.document_converter import DocumentConverter
 
+        # Persist pending correction flags alongside the regenerated output
+        self._flush_manifest()
+
         if self.is_judge_mode:
             # Judge mode: convert the judge markdown directly
             # (it was already updated in-place by apply_correction)
             final_doc_path = self.active_md_path
         else:
-            # Regular mode: rebuild final_document.md from entity files
-            final_doc_path = self._rebuild_final_document()
+            # Regular mode: rebuild final_document.md from entity files,
+            # unless corrections already patched it in place
+            final_doc_path = self.output_dir / "final_document.md"
+            try:
+                st = final_doc_path.stat()
+                synced = self._final_doc_key == (st.st_mtime_ns, st.st_size)
+            except FileNotFoundError:
+                synced = False
+            if not synced:
+                final_doc_path = self._rebuild_final_document()
 
         # Convert markdown to HTML
         converter = DocumentConverter(final_doc_path, self.output_dir)
         html_path = converter.convert()
 
         print(f"✓ HTML regenerated: {html_path.name}")
-        return html_path
+        return html_path, converter.html_bytes
+
+    def _get_openai(self):
+        """
+        Return the AsyncOpenAI client, creating it on first use.
+
+        The client (and its connection pool) is reused across calls. When no
+        shared http_client was given, the client's own pool is bound to the
+        event loop of its first call, so keep one manager per loop.
+        """
+        if self._openai_client is None:
+            # Imported lazily: openai (and httpx) are slow to import and only
+            # needed for AI corrections
+            try:
+                from openai import AsyncOpenAI
+            except ImportError:
+                raise ImportError("The openai package is required for AI corrections") from None
+
+            api_key = os.getenv('OPENAI_API_KEY')
+            if not api_key:
+                raise ValueError(
+                    "OPENAI_API_KEY not found in environment. "
+                    "Please set it in .env file or environment variables."
+                )
+
+            self._openai_client = AsyncOpenAI(api_key=api_key, http_client=self.http_client)
+        return self._openai_client
+
+    @staticmethod
+    def _ai_cache_key(kind: str, model: str, entity_id: str, content: str, user_prompt: str) -> str:
+        """Cache key for one AI response, covering everything that shapes it."""
+        content_hash = hashlib.sha256(content.encode('utf-8')).hexdigest()
+        prompt_hash = hashlib.sha256(user_prompt.encode('utf-8')).hexdigest()
+        raw = f"{kind}|{model}|{AI_CACHE_VERSION}|{entity_id}|{content_hash}|{prompt_hash}"
+        return hashlib.blake2b(raw.encode('utf-8'), digest_size=16).hexdigest()
+
+    def _get_ai_cache(self) -> dict:
+        """Load ai_correction_cache.json on first use."""
+        if self._ai_cache is None:
+            self._ai_cache = {}
+            if self._ai_cache_path.exists():
+                try:
+                    self._ai_cache = _json_loads(self._ai_cache_path.read_bytes())
+                except Exception as e:
+                    print(f"Warning: Could not load AI correction cache: {e}")
+        return self._ai_cache
+
+    def _flush_ai_cache(self) -> None:
+        """Write the AI response cache back to disk."""
+        _atomic_write(self._ai_cache_path, _json_dumps(self._ai_cache))
 
     async def correct_with_ai(self, entity_id: str, user_prompt: str) -> str:
         """
@@ -589,33 +1224,133 @@ corrected: true
         Returns:
             Corrected content generated by AI
         """
-        from openai import AsyncOpenAI
+        corrected_content, cached = await self._correct_entity_with_ai(
+            self._get_openai(), entity_id, user_prompt
+        )
+        if not cached:
+            self._flush_ai_cache()
+        return corrected_content
+
+    async def correct_many_with_ai(
+        self,
+        items: list[tuple[str, str]],
+        *,
+        concurrency: int = 8
+    ) -> list[Optional[str]]:
+        """
+        Generate AI corrections for several entities concurrently
+
+        Args:
+            items: (entity_id, user_prompt) pairs
+            concurrency: Maximum number of requests in flight
+
+        Returns:
+            Corrected content per item, in order (None where the request failed)
+        """
+        client = self._get_openai()
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def correct_one(entity_id: str, user_prompt: str) -> tuple[str, bool]:
+            async with semaphore:
+                return await self._correct_entity_with_ai(client, entity_id, user_prompt)
+
+        outcomes = await asyncio.gather(
+            *(correct_one(entity_id, user_prompt) for entity_id, user_prompt in items),
+            return_exceptions=True
+        )
+
+        results = []
+        for (entity_id, _), outcome in zip(items, outcomes):
+            if isinstance(outcome, BaseException):
+                print(f"Warning: AI correction failed for {entity_id}: {outcome}")
+                results.append(None)
+            else:
+                results.append(outcome[0])
+
+        if any(not isinstance(outcome, BaseException) and not outcome[1] for outcome in outcomes):
+            self._flush_ai_cache()
+        return results
 
+    async def _correct_entity_with_ai(self, client, entity_id: str, user_prompt: str) -> tuple[str, bool]:
+        """
+        Generate one AI correction, consulting the AI response cache first.
+        New responses are added to the in-memory cache; callers flush it.
+
+        Returns:
+            (corrected content, whether it came from the cache)
+        """
         # Load entity content and metadata
         entity_data = self.get_entity_content(entity_id)
 
-        # Get OpenAI API key
-        api_key = os.getenv('OPENAI_API_KEY')
-        if not api_key:
-            raise ValueError(
-                "OPENAI_API_KEY not found in environment. "
-                "Please set it in .env file or environment variables."
-            )
+        cache = self._get_ai_cache()
+        cache_key = self._ai_cache_key(
+            'entity', CORRECTION_MODEL, entity_id, entity_data['content'], user_prompt
+        )
+        if cache_key in cache:
+            return cache[cache_key], True
 
-        # Construct system prompt based on entity type
-        system_prompts = {
-            "text": "You are a document correction assistant. Fix errors in text content while preserving markdown formatting.",
-            "table": "You are a table correction assistant. Fix errors in YAML-formatted tables while preserving structure.",
-            "image_text": "You are a document correction assistant. Fix errors in text extracted from images.",
-            "diagram": "You are a diagram correction assistant. Fix errors in Mermaid diagram syntax.",
-            "form": "You are a form correction assistant. Fix errors in YAML-formatted form data.",
-            "mixed": "You are a document correction assistant. Fix errors in mixed content (text, tables, etc)."
-        }
+        # Call OpenAI API
+        response = await client.chat.completions.create(
+            model=CORRECTION_MODEL,
+            messages=self._correction_messages(entity_data, user_prompt),
+            temperature=0.3  # Lower temperature for factual corrections
+        )
+
+        corrected_content = self._clean_ai_output(response.choices[0].message.content)
+
+        cache[cache_key] = corrected_content
+        return corrected_content, False
+
+    async def stream_correction_with_ai(self, entity_id: str, user_prompt: str) -> AsyncIterator[str]:
+        """
+        Stream an AI correction for an entity as it is generated
+
+        Yields the model's raw text deltas (a cached result is yielded whole).
+        The cleaned final content is added to the AI response cache, so a
+        following correct_with_ai() call for the same input returns it.
+
+        Args:
+            entity_id: Entity ID to correct
+            user_prompt: User's description of the issue
 
-        system_prompt = system_prompts.get(
-            entity_data['type'],
-            system_prompts['text']
+        Yields:
+            Chunks of corrected content
+        """
+        client = self._get_openai()
+        entity_data = self.get_entity_content(entity_id)
+
+        cache = self._get_ai_cache()
+        cache_key = self._ai_cache_key(
+            'entity', CORRECTION_MODEL, entity_id, entity_data['content'], user_prompt
         )
+        if cache_key in cache:
+            yield cache[cache_key]
+            return
+
+        stream = await client.chat.completions.create(
+            model=CORRECTION_MODEL,
+            messages=self._correction_messages(entity_data, user_prompt),
+            temperature=0.3,
+            stream=True
+        )
+
+        parts = []
+        async for chunk in stream:
+            if not chunk.choices:
+                continue
+            delta = chunk.choices[0].delta.content
+            if delta:
+                parts.append(delta)
+                yield delta
+
+        cache[cache_key] = self._clean_ai_output(''.join(parts))
+        self._flush_ai_cache()
+
+    @staticmethod
+    def _correction_messages(entity_data: dict, user_prompt: str) -> list[dict]:
+        """Build the chat messages for a single-entity AI correction."""
+        # Choose system prompt based on entity type
+        system_prompt = _SYSTEM_PROMPTS.get(entity_data['type'], _DEFAULT_SYSTEM_PROMPT)
 
         # Construct user prompt
         full_prompt = f"""Original Content:
@@ -628,35 +1363,38 @@ Issue Description:
 
 Please provide the corrected content in the same format. Only output the corrected content, no explanations."""
 
-        # Call OpenAI API
-        client = AsyncOpenAI(api_key=api_key)
-
-        response = await client.chat.completions.create(
-            model="gpt-4",
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": full_prompt}
-            ],
-            temperature=0.3  # Lower temperature for factual corrections
-        )
+        return [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": full_prompt}
+        ]
 
-        corrected_content = response.choices[0].message.content.strip()
+    @staticmethod
+    def _clean_ai_output(content: str) -> str:
+        """Strip whitespace and surrounding code fences from a model response."""
+        corrected_content = content.strip()
 
-        # Clean up (remove code fences if present)
+        # Clean up (remove code fences if present): drop the first and last
+        # lines by slicing between the first and last newline
         if corrected_content.startswith('```'):
-            lines = corrected_content.split('\n')
-            # Remove first and last lines (code fences)
-            corrected_content = '\n'.join(lines[1:-1]) if len(lines) > 2 else corrected_content
+            first_nl = corrected_content.find('\n')
+            last_nl = corrected_content.rfind('\n')
+            if first_nl < last_nl:
+                corrected_content = corrected_content[first_nl + 1:last_nl]
 
         return corrected_content
 
-    async def document_wide_correction(self, user_prompt: str) -> list[dict]:
+    async def document_wide_correction(self, user_prompt: str, bulk: bool = False) -> list[dict]:
         """
         Apply document-wide AI corrections based on user prompt
 
+        By default each entity is sent in its own small request, with at most
+        DOCUMENT_WIDE_MAX_CONCURRENT requests in flight. With bulk=True the
+        entities are instead packed into size-bounded multi-entity prompts.
+
         Args:
             user_prompt: Natural language instruction for corrections
                         (e.g., "Fix all date formats to YYYY-MM-DD")
+            bulk: Send entities in multi-entity batches instead of one request each
 
         Returns:
             List of proposed changes with structure:
@@ -670,31 +1408,144 @@ Please provide the corrected content in the same format. Only output the correct
                 ...
             ]
         """
-        from openai import AsyncOpenAI
+        client = self._get_openai()
+
+        # Load all entities (off the event loop)
+        all_entities = await asyncio.to_thread(self._load_all_entities)
 
-        # Get API key
-        api_key = os.getenv('OPENAI_API_KEY')
-        if not api_key:
-            raise ValueError("OPENAI_API_KEY environment variable not set")
+        semaphore = asyncio.Semaphore(DOCUMENT_WIDE_MAX_CONCURRENT)
 
-        # Load all entities
-        manifest = self._load_manifest()
-        all_entities = []
+        if bulk:
+            # Split the document into size-bounded batches and query them
+            # concurrently, so wall time tracks the slowest batch rather than
+            # the sum of all of them
+            async def propose(batch: list[dict]) -> list[dict]:
+                async with semaphore:
+                    return await self._propose_corrections(client, batch, user_prompt)
 
-        for entity_info in manifest.get('entities', []):
-            entity_id = entity_info['id']
-            entity_data = self.get_entity_content(entity_id)
-            if entity_data:
-                all_entities.append({
-                    'entity_id': entity_id,
-                    'type': entity_data['type'],
-                    'page': entity_data['page'],
-                    'content': entity_data['content']
-                })
+            batches = self._batch_entities(all_entities)
+            results = await asyncio.gather(*(propose(batch) for batch in batches))
+        else:
+            # One small request per entity; a failed entity is skipped
+            # unless every request failed
+            # Cached responses (including "no change") skip the request;
+            # new ones are written back once at the end
+            cache = self._get_ai_cache()
+            cache_updated = False
+
+            async def propose_one(entity: dict) -> Optional[dict]:
+                nonlocal cache_updated
+                cache_key = self._ai_cache_key(
+                    'document_wide', DOCUMENT_WIDE_MODEL, entity['entity_id'], entity['content'], user_prompt
+                )
+                if cache_key in cache:
+                    return cache[cache_key]
+                async with semaphore:
+                    correction = await self._propose_entity_correction(client, entity, user_prompt)
+                cache[cache_key] = correction
+                cache_updated = True
+                return correction
+
+            outcomes = await asyncio.gather(
+                *(propose_one(entity) for entity in all_entities), return_exceptions=True
+            )
+            if cache_updated:
+                self._flush_ai_cache()
+            errors = [outcome for outcome in outcomes if isinstance(outcome, BaseException)]
+            if errors and len(errors) == len(outcomes):
+                raise errors[0]
+            for entity, outcome in zip(all_entities, outcomes):
+                if isinstance(outcome, BaseException):
+                    print(f"Warning: AI correction failed for {entity['entity_id']}: {outcome}")
+            results = [[outcome for outcome in outcomes if isinstance(outcome, dict)]]
 
+        # Build proposed changes with original content
+        entities_by_id = {entity['entity_id']: entity for entity in all_entities}
+        proposed_changes = []
+        for corrections in results:
+            for correction in corrections:
+                entity = entities_by_id.get(correction['entity_id'])
+                if entity:
+                    proposed_changes.append({
+                        'entity_id': entity['entity_id'],
+                        'original_content': entity['content'],
+                        'corrected_content': correction['corrected_content'],
+                        'reason': correction['reason']
+                    })
+
+        return proposed_changes
+
+    def _load_all_entities(self) -> list[dict]:
+        """
+        Read the content of every manifest entity, in manifest order.
+
+        The manifest and markdown caches are primed first so that workers only
+        do dict lookups or, in the fallback case, independent entity file reads.
+        """
+        manifest = self._get_manifest()
+        if self.active_md_path is not None and self.active_md_path.exists():
+            self._get_md_entity_index()
+
+        def read(entity_id: str) -> Optional[dict]:
+            try:
+                return self.get_entity_content(entity_id)
+            except KeyError as e:
+                print(f"Warning: Skipping entity: {e.args[0]}")
+                return None
+
+        entity_ids = [entity_info['id'] for entity_info in manifest.get('entities', [])]
+        with ThreadPoolExecutor(max_workers=ENTITY_READ_WORKERS) as executor:
+            results = list(executor.map(read, entity_ids))
+
+        return [
+            {
+                'entity_id': entity_data['entity_id'],
+                'type': entity_data['type'],
+                'page': entity_data['page'],
+                'content': entity_data['content']
+            }
+            for entity_data in results
+            if entity_data
+        ]
+
+    def _batch_entities(self, entities: list[dict]) -> list[list[dict]]:
+        """
+        Group entities into batches of at most DOCUMENT_WIDE_BATCH_CHARS
+        characters of content, preserving document order.
+        """
+        batches = []
+        current = []
+        current_size = 0
+
+        for entity in entities:
+            size = len(entity['content'])
+            if current and current_size + size > DOCUMENT_WIDE_BATCH_CHARS:
+                batches.append(current)
+                current = []
+                current_size = 0
+            current.append(entity)
+            current_size += size
+
+        if current:
+            batches.append(current)
+
+        return batches
+
+    async def _propose_corrections(self, client, entities: list[dict], user_prompt: str) -> list[dict]:
+        """
+        Ask the LLM for corrections to one batch of entities
+
+        Args:
+            client: AsyncOpenAI client
+            entities: Batch of {entity_id, type, page, content} dicts
+            user_prompt: Natural language instruction for corrections
+
+        Returns:
+            List of {entity_id, corrected_content, reason} dicts
+        """
         # Prepare document context for AI
         document_context = "# Document Entities\n\n"
-        for entity in all_entities:
+        for entity in entities:
             document_context += f"## Entity {entity['entity_id']} (Page {entity['page']}, Type: {entity['type']})\n"
             document_context += f"```\n{entity['content']}\n```\n\n"
 
@@ -726,10 +1577,8 @@ User Instruction:
 Analyze all entities above and propose corrections. Output in the specified JSON format."""
 
         # Call OpenAI API
-        client = AsyncOpenAI(api_key=api_key)
-
         response = await client.chat.completions.create(
-            model="gpt-4o",  # Using gpt-4o for better JSON output
+            model=DOCUMENT_WIDE_MODEL,
             messages=[
                 {"role": "system", "content": system_prompt},
                 {"role": "user", "content": full_prompt}
@@ -739,25 +1588,64 @@ Analyze all entities above and propose corrections. Output in the specified JSON
         )
 
         # Parse AI response
-        import json
         ai_response = response.choices[0].message.content.strip()
         corrections_data = json.loads(ai_response)
+        return corrections_data.get('corrections', [])
 
-        # Build proposed changes with original content
-        proposed_changes = []
-        for correction in corrections_data.get('corrections', []):
-            entity_id = correction['entity_id']
-            # Get original content
-            entity_data = self.get_entity_content(entity_id)
-            if entity_data:
-                proposed_changes.append({
-                    'entity_id': entity_id,
-                    'original_content': entity_data['content'],
-                    'corrected_content': correction['corrected_content'],
-                    'reason': correction['reason']
-                })
+    async def _propose_entity_correction(self, client, entity: dict, user_prompt: str) -> Optional[dict]:
+        """
+        Ask the LLM whether a single entity needs correcting
 
-        return proposed_changes
+        Args:
+            client: AsyncOpenAI client
+            entity: {entity_id, type, page, content} dict
+            user_prompt: Natural language instruction for corrections
+
+        Returns:
+            {entity_id, corrected_content, reason} dict, or None if no change is needed
+        """
+        system_prompt = """You are a document correction assistant. You are given one entity of a larger document and an instruction that applies to the whole document.
+
+Output in this EXACT JSON format:
+{
+  "corrected_content": "...",
+  "reason": "Brief explanation of what was corrected"
+}
+
+IMPORTANT:
+- If the entity does not need changes, output {"corrected_content": null, "reason": null}
+- Output ONLY valid JSON, no explanations outside the JSON
+- Preserve the original format (markdown, YAML, etc.) of the entity
+- The corrected_content should be the COMPLETE corrected content, not just changes"""
+
+        full_prompt = f"""## Entity {entity['entity_id']} (Page {entity['page']}, Type: {entity['type']})
+```
+{entity['content']}
+```
+
+User Instruction:
+{user_prompt}"""
+
+        response = await client.chat.completions.create(
+            model=DOCUMENT_WIDE_MODEL,
+            messages=[
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": full_prompt}
+            ],
+            temperature=0.3,
+            response_format={"type": "json_object"}
+        )
+
+        correction = json.loads(response.choices[0].message.content.strip())
+        corrected_content = correction.get('corrected_content')
+        if not corrected_content or corrected_content == entity['content']:
+            return None
+
+        return {
+            'entity_id': entity['entity_id'],
+            'corrected_content': corrected_content,
+            'reason': correction.get('reason') or '',
+        }
 
     def apply_document_wide_corrections(self, corrections: list[dict], user_prompt: str) -> dict:
         """
@@ -770,44 +1658,22 @@ Analyze all entities above and propose corrections. Output in the specified JSON
         Returns:
             dict with 'success', 'corrections_applied', 'html_path'
         """
-        timestamp = datetime.now().isoformat()
-        corrections_applied = []
-
-        # Apply each correction
-        for correction in corrections:
-            try:
-                # Create CorrectionEntry object
-                correction_entry = CorrectionEntry(
-                    entity_id=correction['entity_id'],
-                    correction_type='ai',
-                    original_content=correction.get('original_content', ''),
-                    corrected_content=correction['corrected_content'],
-                    reason=f"Document-wide AI correction: {correction['reason']}",
-                    timestamp=timestamp,
-                    user_prompt=user_prompt
-                )
-
-                # Save the correction
-                self.save_correction(correction_entry)
-
-                # Apply to entity file
-                self.apply_correction(
-                    entity_id=correction['entity_id'],
-                    corrected_content=correction['corrected_content'],
-                    correction_type='ai',
-                    reason=f"Document-wide AI correction: {correction['reason']}",
-                    user_prompt=user_prompt
-                )
-
-                corrections_applied.append(correction['entity_id'])
-            except Exception as e:
-                import traceback
-                traceback.print_exc()
-                print(f"Warning: Failed to apply correction to {correction['entity_id']}: {e}")
+        corrections_applied = self.apply_corrections_batch(
+            [
+                {
+                    'entity_id': correction['entity_id'],
+                    'corrected_content': correction['corrected_content'],
+                    'reason': f"Document-wide AI correction: {correction['reason']}",
+                }
+                for correction in corrections
+            ],
+            correction_type='ai',
+            user_prompt=user_prompt
+        )
 
         # Regenerate HTML
         try:
-            html_path = self.regenerate_html()
+            html_path, _ = self.regenerate_html()
         except Exception as e:
             return {
                 'success': False,
@@ -13,14 +13,28 @@ Usage:
     judge.run()
 """
 
+import asyncio
+import hashlib
+import io
+import json
+import mmap
 import os
+import random
 import re
+from contextlib import nullcontext
+from functools import lru_cache
 from pathlib import Path
 from dataclasses import dataclass
-from openai import OpenAI
+import httpx
+from openai import AsyncOpenAI, APIConnectionError
 
+try:
+    import tiktoken
+except ImportError:  # Optional: fall back to the CHARS_PER_TOKEN estimate
+    tiktoken = None
 
-# Token estimation: ~4 chars per token
+
+# Token estimation when tiktoken is not installed: ~4 chars per token
 CHARS_PER_TOKEN = 4
 
 # Leave room for system prompt (~2K tokens) + response (~equal to input)
@@ -28,6 +42,89 @@ CHARS_PER_TOKEN = 4
 MAX_CHUNK_TOKENS = 30_000
 MAX_CHUNK_CHARS = MAX_CHUNK_TOKENS * CHARS_PER_TOKEN  # ~120K chars
 
+# Chunks are judged concurrently; at most this many LLM requests are in
+# flight at once (override with the JUDGE_MAX_CONCURRENT env var)
+DEFAULT_MAX_CONCURRENT = 8
+
+# Fixed part of every chunk's user message (kept byte-identical across
+# chunks so it extends the cacheable prompt prefix)
+ENTITY_TAG_INSTRUCTIONS = """
+**CRITICAL**: The document uses `[ENTITY:EXXX]` tags to mark entity boundaries.
+
+Rules for entity tags:
+- Every `[ENTITY:EXXX]` tag MUST appear in your output
+- When MERGING entities, keep only the FIRST entity's tag and DELETE the others
+- When NOT merging, keep each tag exactly where it is
+- NEVER remove ALL tags - at minimum, merged groups must retain one tag each
+
+Return the corrected document content followed by a `## Change Log` section.
+If no changes are needed, return the content as-is with an empty change log."""
+
+# Transient API failures (rate limits, 5xx, timeouts, dropped connections)
+# are retried by the OpenAI client with jittered exponential backoff. A
+# response stream cut off midway is retried here, up to this many times.
+MAX_API_RETRIES = 5
+MAX_STREAM_RETRIES = 2
+
+# On-disk cache of raw judge responses, keyed by a hash of the full request
+# (model, prompts, chunk content), so re-running the judge on unchanged
+# chunks skips the API. Only complete responses (finish_reason "stop") are
+# cached, so truncated or empty ones are retried on the next run. Set
+# JUDGE_CACHE_DIR to relocate it.
+JUDGE_CACHE_DIR = Path(os.getenv("JUDGE_CACHE_DIR", "~/.cache/document_judge")).expanduser()
+
+# Batch API mode: how long to wait between status polls (doubling up to the max)
+BATCH_POLL_INITIAL_SECONDS = 10
+BATCH_POLL_MAX_SECONDS = 300
+
+
+# Entity marker comment, e.g. <!-- Entity: E001 | Type: TEXT | Page: 1 -->
+# (bytes pattern: the input document is scanned memory-mapped)
+_ENTITY_MARKER_RE = re.compile(rb'<!-- Entity: (E\d+) \| Type: .*? \| Page: \d+ -->')
+
+# Placeholder tag sent to the LLM in place of a marker, e.g. [ENTITY:E001]
+_PLACEHOLDER_RE = re.compile(r'\[ENTITY:(E\d+)\]')
+
+# One bullet item in a change log
+_CHANGE_ITEM_RE = re.compile(r'(?m)^\s*[-*]\s')
+
+_CODE_FENCE_RE = re.compile(r'^```(?:markdown|md)?\s*\n(.*?)```\s*$', re.DOTALL)
+_TRAILING_FENCE_RE = re.compile(r'\n?```\s*$')
+
+# Change log headings, tried in this order
+_CHANGE_LOG_RES = tuple(re.compile(pattern, re.IGNORECASE) for pattern in (
+    r'\n## Change Log\s*\n',
+    r'\n## Changelog\s*\n',
+    r'\n## Changes\s*\n',
+    r'\n---\s*\n## Change Log',
+))
+
+
+_ASCII_WHITESPACE = frozenset(b' \t\n\r\x0b\x0c')
+
+
+def _decode(raw: bytes) -> str:
+    """Decode UTF-8 document bytes with text-mode newline translation."""
+    text = raw.decode('utf-8')
+    if '\r' in text:
+        text = text.replace('\r\n', '\n').replace('\r', '\n')
+    return text
+
+
+@lru_cache(maxsize=4)
+def _encoder(model: str):
+    """tiktoken encoding for a model (o200k_base for models tiktoken doesn't know)."""
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        return tiktoken.get_encoding("o200k_base")
+
+
+@lru_cache(maxsize=4)
+def _read_judge_prompt(path: str, mtime_ns: int) -> str:
+    """Read the judge prompt once per (path, mtime) per process."""
+    return Path(path).read_text(encoding='utf-8')
+
 
 @dataclass
 class DocumentChunk:
@@ -49,9 +146,15 @@ class DocumentJudge:
     markers when sending to the LLM to prevent marker stripping.
     """
 
-    def __init__(self, output_dir: Path, model: str = "gpt-4o"):
+    def __init__(self, output_dir: Path, model: str = "gpt-4o", use_batch: bool = False,
+                 use_cache: bool = True):
         self.output_dir = Path(output_dir)
         self.model = model
+        # Submit all chunks as one OpenAI Batch API job (half the token cost,
+        # separate rate limits, but up to 24h turnaround)
+        self.use_batch = use_batch
+        # Read cached judge responses; fresh responses are cached either way
+        self.use_cache = use_cache
         self.input_path = self.output_dir / "final_document.md"
         self.output_path = self.output_dir / "final_document_judge.md"
 
@@ -61,6 +164,9 @@ class DocumentJudge:
         # Load judge prompt
         self.judge_prompt = self._load_judge_prompt()
 
+        # AsyncOpenAI client, created per run() (it is bound to the run's event loop)
+        self.client = None
+
     def _load_judge_prompt(self) -> str:
         """Load the judge system prompt from judge_prompt.md"""
         prompt_path = Path(__file__).parent.parent.parent / "judge_prompt.md"
@@ -69,7 +175,8 @@ class DocumentJudge:
                 f"Judge prompt not found: {prompt_path}\n"
                 f"Create judge_prompt.md in the project root."
             )
-        return prompt_path.read_text(encoding='utf-8')
+        # Keyed on mtime so edits to the prompt are still picked up
+        return _read_judge_prompt(str(prompt_path), prompt_path.stat().st_mtime_ns)
 
     def run(self) -> Path:
         """
@@ -84,15 +191,25 @@ class DocumentJudge:
         print(f"  Input:  {self.input_path.name}")
         print(f"  Output: {self.output_path.name}")
         print(f"  Model:  {self.model}")
+        if self.use_batch:
+            print(f"  Mode:   Batch API")
 
-        # Read document
-        raw_content = self.input_path.read_text(encoding='utf-8')
-
-        # Parse into frontmatter + entity blocks
-        frontmatter, entity_blocks = self._parse_document(raw_content)
+        # Memory-map the document and parse it into frontmatter + entity
+        # blocks, decoding only the slices that are kept
+        with open(self.input_path, 'rb') as f:
+            size = os.fstat(f.fileno()).st_size
+            with (mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if size else nullcontext(b'')) as raw_content:
+                frontmatter, entity_blocks = self._parse_document(raw_content)
 
         print(f"  Entities: {len(entity_blocks)}")
 
+        # Nothing for the LLM to judge: pass the document through unchanged
+        if not entity_blocks:
+            print(f"  No entity blocks found - skipping LLM.")
+            self._reassemble(frontmatter, [], [])
+            print(f"{'='*60}\n")
+            return self.output_path
+
         # Build marker map: entity_id -> full marker
         self.marker_map = {}
         for block in entity_blocks:
@@ -103,74 +220,74 @@ class DocumentJudge:
         print(f"  Chunks: {len(chunks)}")
         print(f"{'='*60}\n")
 
-        # Process each chunk through LLM
+        # Process all chunks through the LLM concurrently, or as one batch
+        # job (results keep chunk order)
+        if self.use_batch:
+            results = asyncio.run(self._process_chunks_batch(chunks))
+        else:
+            results = asyncio.run(self._process_chunks(chunks))
+
         corrected_chunks = []
         all_changes = []
+        total_changes = 0
 
-        for chunk in chunks:
-            print(f"  Processing chunk {chunk.index}/{chunk.total} "
-                  f"({len(chunk.entity_ids)} entities: "
-                  f"{chunk.entity_ids[0]}..{chunk.entity_ids[-1]})...")
-
-            corrected_content, changes = self._process_chunk(chunk)
+        for chunk, (corrected_content, changes) in zip(chunks, results):
             corrected_chunks.append(corrected_content)
 
             if changes:
                 all_changes.append(f"## Chunk {chunk.index}\n{changes}")
+                total_changes += len(_CHANGE_ITEM_RE.findall(changes))
 
-            print(f"    Done.")
-
-        # Reassemble document
-        final_content = self._reassemble(frontmatter, corrected_chunks, all_changes)
-
-        # Write output
-        self.output_path.write_text(final_content, encoding='utf-8')
+        # Reassemble document and write output
+        self._reassemble(frontmatter, corrected_chunks, all_changes)
 
         print(f"\n{'='*60}")
         print(f"  Judge complete!")
         print(f"  Output: {self.output_path}")
         if all_changes:
-            print(f"  Changes: {sum(c.count('-') for c in all_changes)} items")
+            print(f"  Changes: {total_changes} items")
         else:
             print(f"  No changes needed.")
         print(f"{'='*60}\n")
 
         return self.output_path
 
-    def _parse_document(self, content: str) -> tuple[str, list[dict]]:
+    def _parse_document(self, content: bytes) -> tuple[str, list[dict]]:
         """
         Parse document into frontmatter and entity blocks.
 
+        Args:
+            content: Raw UTF-8 document (bytes or a memory map)
+
         Returns:
             (frontmatter_str, list of {marker, content, entity_id})
         """
-        entity_pattern = r'(<!-- Entity: (E\d+) \| Type: .*? \| Page: \d+ -->)'
-        first_match = re.search(entity_pattern, content)
+        matches = list(_ENTITY_MARKER_RE.finditer(content))
 
-        if not first_match:
-            return content, []
+        if not matches:
+            return _decode(content[:]), []
 
-        frontmatter = content[:first_match.start()].rstrip()
+        frontmatter = _decode(content[:matches[0].start()]).rstrip()
 
-        # Split by entity markers, keeping the markers
-        parts = re.split(r'(<!-- Entity: E\d+ \| Type: .*? \| Page: \d+ -->)', content[first_match.start():])
+        # Each block runs from the end of its marker to the start of the next
+        ends = [match.start() for match in matches[1:]]
+        ends.append(len(content))
 
         entity_blocks = []
-        i = 0
-        while i < len(parts):
-            part = parts[i].strip()
-            if re.match(r'<!-- Entity: (E\d+) \| Type: .*? \| Page: \d+ -->', part):
-                marker = part
-                entity_id = re.search(r'E\d+', marker).group()
-                block_content = parts[i + 1].strip() if i + 1 < len(parts) else ""
-                entity_blocks.append({
-                    'marker': marker,
-                    'content': block_content,
-                    'entity_id': entity_id
-                })
-                i += 2
-            else:
-                i += 1
+        for match, end in zip(matches, ends):
+            # Trim surrounding whitespace by moving the slice bounds, so each
+            # block is copied and decoded once (the final strip() only has
+            # non-ASCII whitespace left to handle and normally returns as-is)
+            start = match.end()
+            while start < end and content[start] in _ASCII_WHITESPACE:
+                start += 1
+            while end > start and content[end - 1] in _ASCII_WHITESPACE:
+                end -= 1
+            entity_blocks.append({
+                'marker': match.group(0).decode('utf-8'),
+                'content': _decode(content[start:end]).strip(),
+                'entity_id': match.group(1).decode('ascii')
+            })
 
         return frontmatter, entity_blocks
 
@@ -178,72 +295,300 @@ class DocumentJudge:
         """
         Group entity blocks into chunks that fit within token limits.
         Uses placeholder tokens instead of full markers for size estimation.
+
+        Sizes are counted in tokens with tiktoken when it is installed,
+        otherwise estimated from character counts.
         """
         if not entity_blocks:
             return []
 
-        chunks = []
-        current_blocks = []
-        current_size = 0
-
-        for block in entity_blocks:
-            # Use placeholder for size estimation
-            block_text = f"\n[ENTITY:{block['entity_id']}]\n\n{block['content']}\n"
-            block_size = len(block_text)
-
-            if current_blocks and (current_size + block_size) > MAX_CHUNK_CHARS:
-                chunk_content = self._blocks_to_placeholder_text(current_blocks)
-                chunks.append(DocumentChunk(
-                    content=chunk_content,
-                    entity_ids=[b['entity_id'] for b in current_blocks],
-                    index=len(chunks) + 1,
-                    total=0
-                ))
-                current_blocks = []
-                current_size = 0
-
-            current_blocks.append(block)
-            current_size += block_size
+        # Use placeholder for size estimation
+        block_texts = [
+            f"\n[ENTITY:{block['entity_id']}]\n\n{block['content']}\n" for block in entity_blocks
+        ]
+        if tiktoken is not None:
+            encoded = _encoder(self.model).encode_batch(block_texts, disallowed_special=())
+            block_sizes = [len(tokens) for tokens in encoded]
+            max_size = MAX_CHUNK_TOKENS
+        else:
+            block_sizes = [len(text) for text in block_texts]
+            max_size = MAX_CHUNK_CHARS
+
+        # Greedy packing gives the fewest chunks possible without reordering
+        # entities. Keep that count but balance the chunk sizes: find the
+        # smallest capacity that still needs no more chunks. Chunks are judged
+        # concurrently, so the largest one sets the wall-clock time.
+        groups = self._pack_blocks(block_sizes, max_size)
+        if len(groups) > 1:
+            low = max(max(block_sizes), -(-sum(block_sizes) // len(groups)))
+            high = max_size
+            while low < high:
+                capacity = (low + high) // 2
+                if len(self._pack_blocks(block_sizes, capacity)) <= len(groups):
+                    high = capacity
+                else:
+                    low = capacity + 1
+            if low < max_size:
+                groups = self._pack_blocks(block_sizes, low)
 
-        # Flush remaining
-        if current_blocks:
-            chunk_content = self._blocks_to_placeholder_text(current_blocks)
+        chunks = []
+        for start, end in groups:
+            current_blocks = entity_blocks[start:end]
             chunks.append(DocumentChunk(
-                content=chunk_content,
+                content=self._blocks_to_placeholder_text(current_blocks),
                 entity_ids=[b['entity_id'] for b in current_blocks],
                 index=len(chunks) + 1,
-                total=0
+                total=len(groups)
             ))
 
-        for chunk in chunks:
-            chunk.total = len(chunks)
-
         return chunks
 
+    @staticmethod
+    def _pack_blocks(block_sizes: list[int], capacity: int) -> list[tuple[int, int]]:
+        """
+        Greedily group consecutive blocks into chunks of at most capacity
+        (a block larger than capacity gets a chunk of its own).
+
+        Returns:
+            (start, end) block index ranges, one per chunk
+        """
+        groups = []
+        start = 0
+        current_size = 0
+
+        for i, block_size in enumerate(block_sizes):
+            if i > start and (current_size + block_size) > capacity:
+                groups.append((start, i))
+                start = i
+                current_size = 0
+            current_size += block_size
+
+        # Flush remaining
+        groups.append((start, len(block_sizes)))
+        return groups
+
     def _blocks_to_placeholder_text(self, blocks: list[dict]) -> str:
         """Convert entity blocks to text using placeholder tokens."""
+        # One flat join; each block is "\n[ENTITY:EXXX]\n\n<content>\n",
+        # separated by a blank line
         parts = []
+        append = parts.append
         for block in blocks:
-            parts.append(f"\n[ENTITY:{block['entity_id']}]\n\n{block['content']}\n")
-        return '\n'.join(parts)
+            append('\n[ENTITY:')
+            append(block['entity_id'])
+            append(']\n\n')
+            append(block['content'])
+            append('\n\n')
+        if parts:
+            parts[-1] = '\n'
+        return ''.join(parts)
+
+    async def _process_chunks(self, chunks: list[DocumentChunk]) -> list[tuple[str, str]]:
+        """
+        Process all chunks through the LLM, at most JUDGE_MAX_CONCURRENT at a time.
 
-    def _process_chunk(self, chunk: DocumentChunk) -> tuple[str, str]:
+        Returns:
+            (corrected_content, change_log_text) per chunk, in chunk order
         """
-        Process a single chunk through the LLM.
+        api_key = os.getenv('OPENAI_API_KEY')
+        if not api_key:
+            raise ValueError("OPENAI_API_KEY environment variable not set")
 
-        Uses [ENTITY:E001] placeholders instead of full HTML comment markers.
-        After LLM response, restores full markers and validates.
+        self.client = AsyncOpenAI(api_key=api_key, max_retries=MAX_API_RETRIES)
+        semaphore = asyncio.Semaphore(int(os.getenv("JUDGE_MAX_CONCURRENT", DEFAULT_MAX_CONCURRENT)))
+
+        async def bounded(chunk: DocumentChunk) -> tuple[str, str]:
+            async with semaphore:
+                print(f"  Processing chunk {chunk.index}/{chunk.total} "
+                      f"({len(chunk.entity_ids)} entities: "
+                      f"{chunk.entity_ids[0]}..{chunk.entity_ids[-1]})...")
+                result = await self._process_chunk(chunk)
+                print(f"    Chunk {chunk.index} done.")
+                return result
+
+        try:
+            return await asyncio.gather(*(bounded(chunk) for chunk in chunks))
+        finally:
+            await self.client.close()
+
+    async def _process_chunks_batch(self, chunks: list[DocumentChunk]) -> list[tuple[str, str]]:
+        """
+        Process all chunks as a single OpenAI Batch API job.
+
+        Uploads one JSONL request per chunk that is not in the response
+        cache, polls until the batch finishes, then maps each response back
+        to its chunk via custom_id.
 
         Returns:
-            (corrected_content_with_full_markers, change_log_text)
+            (corrected_content, change_log_text) per chunk, in chunk order
+        """
+        chat_requests = {f"chunk-{chunk.index}": self._chat_request(chunk) for chunk in chunks}
+
+        responses = {}
+        for custom_id, request in chat_requests.items():
+            cached = self._load_cached_result(request)
+            if cached is not None:
+                responses[custom_id] = cached
+
+        pending = [custom_id for custom_id in chat_requests if custom_id not in responses]
+        if pending:
+            await self._run_batch(chat_requests, pending, responses)
+
+        results = []
+        for chunk in chunks:
+            result = responses.get(f"chunk-{chunk.index}")
+            if result is None:
+                raise RuntimeError(f"Judge batch has no successful response for chunk {chunk.index}")
+            results.append(self._parse_chunk_result(chunk, result))
+        return results
+
+    async def _run_batch(self, chat_requests: dict[str, dict], pending: list[str], responses: dict[str, str]) -> None:
+        """
+        Submit the pending requests as one Batch API job and wait for it.
+        Successful responses are added to responses (and the response cache).
         """
         api_key = os.getenv('OPENAI_API_KEY')
         if not api_key:
             raise ValueError("OPENAI_API_KEY environment variable not set")
 
-        client = OpenAI(api_key=api_key)
+        self.client = AsyncOpenAI(api_key=api_key, max_retries=MAX_API_RETRIES)
+        try:
+            lines = []
+            for custom_id in pending:
+                lines.append(json.dumps({
+                    "custom_id": custom_id,
+                    "method": "POST",
+                    "url": "/v1/chat/completions",
+                    "body": chat_requests[custom_id],
+                }))
+            jsonl_bytes = ('\n'.join(lines) + '\n').encode('utf-8')
+
+            input_file = await self.client.files.create(
+                file=("judge_batch.jsonl", io.BytesIO(jsonl_bytes)), purpose="batch"
+            )
+            batch = await self.client.batches.create(
+                input_file_id=input_file.id,
+                endpoint="/v1/chat/completions",
+                completion_window="24h",
+            )
+            print(f"  Submitted batch {batch.id} ({len(pending)} requests)")
+
+            # Poll with exponential backoff until the batch reaches a final state
+            delay = BATCH_POLL_INITIAL_SECONDS
+            while batch.status not in ("completed", "failed", "expired", "cancelled"):
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, BATCH_POLL_MAX_SECONDS)
+                batch = await self.client.batches.retrieve(batch.id)
+                print(f"    Batch status: {batch.status}")
+
+            if batch.status != "completed" or not batch.output_file_id:
+                raise RuntimeError(f"Judge batch {batch.id} ended with status '{batch.status}'")
+
+            output = await self.client.files.content(batch.output_file_id)
+        finally:
+            await self.client.close()
+
+        # Responses come back in arbitrary order; key them by custom_id
+        for line in output.text.splitlines():
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            response = record.get('response') or {}
+            custom_id = record.get('custom_id')
+            if response.get('status_code') == 200 and custom_id in chat_requests:
+                choice = response['body']['choices'][0]
+                result = choice['message']['content']
+                responses[custom_id] = result
+                self._store_cached_result(chat_requests[custom_id], result, choice.get('finish_reason'))
+
+    async def _process_chunk(self, chunk: DocumentChunk) -> tuple[str, str]:
+        """
+        Process a single chunk through the LLM.
 
-        # Build the user message
+        Uses [ENTITY:E001] placeholders instead of full HTML comment markers.
+        After LLM response, restores full markers and validates.
+
+        Returns:
+            (corrected_content_with_full_markers, change_log_text)
+        """
+        # Call LLM, streaming the response: long chunk responses arrive
+        # incrementally instead of as one body after the whole generation,
+        # which also keeps the connection active for slow chunks
+        request = self._chat_request(chunk)
+        cached = self._load_cached_result(request)
+        if cached is not None:
+            print(f"    Chunk {chunk.index}: using cached judge response.")
+            return self._parse_chunk_result(chunk, cached)
+
+        for attempt in range(MAX_STREAM_RETRIES + 1):
+            stream = await self.client.chat.completions.create(**request, stream=True)
+
+            parts = []
+            finish_reason = None
+            try:
+                async for event in stream:
+                    if not event.choices:
+                        continue
+                    choice = event.choices[0]
+                    if choice.delta.content:
+                        parts.append(choice.delta.content)
+                    if choice.finish_reason:
+                        finish_reason = choice.finish_reason
+                break
+            except (APIConnectionError, httpx.TransportError) as e:
+                if attempt == MAX_STREAM_RETRIES:
+                    raise
+                delay = random.uniform(1, 2 ** (attempt + 2))
+                print(f"    WARNING: chunk {chunk.index} response interrupted ({e}); "
+                      f"retrying in {delay:.0f}s...")
+                await asyncio.sleep(delay)
+
+        result = ''.join(parts)
+        if finish_reason == "length":
+            print(f"    WARNING: chunk {chunk.index} response hit the output token limit")
+        self._store_cached_result(request, result, finish_reason)
+
+        return self._parse_chunk_result(chunk, result)
+
+    @staticmethod
+    def _cache_path(request: dict) -> Path:
+        """Response cache file for a chat request."""
+        key = hashlib.blake2b(
+            json.dumps(request, sort_keys=True, ensure_ascii=False).encode('utf-8'), digest_size=16
+        ).hexdigest()
+        return JUDGE_CACHE_DIR / f"{key}.json"
+
+    def _load_cached_result(self, request: dict) -> str | None:
+        """Return the cached raw LLM response for a request, if any."""
+        if not self.use_cache:
+            return None
+        try:
+            return json.loads(self._cache_path(request).read_text(encoding='utf-8'))['result']
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def _store_cached_result(self, request: dict, result: str, finish_reason: str | None) -> None:
+        """
+        Cache a raw LLM response (best effort: caching failures are not fatal).
+        Truncated, filtered or empty responses are not cached.
+        """
+        if finish_reason != "stop" or not result:
+            return
+        cache_path = self._cache_path(request)
+        try:
+            JUDGE_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            tmp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.tmp")
+            tmp_path.write_text(json.dumps({"result": result}, ensure_ascii=False), encoding='utf-8')
+            os.replace(tmp_path, cache_path)
+        except OSError as e:
+            print(f"    WARNING: could not write judge cache: {e}")
+
+    def _chat_request(self, chunk: DocumentChunk) -> dict:
+        """Build the chat completion request parameters for a chunk."""
+        # Build the user message. The static instructions come first and
+        # everything chunk-specific last, so the system prompt plus the
+        # instructions form an identical prefix across chunks (and runs) that
+        # OpenAI's automatic prompt caching can reuse.
         if chunk.total == 1:
             context_note = ""
         else:
@@ -253,36 +598,29 @@ class DocumentJudge:
                 f"Do not add document-level frontmatter or headers to this chunk."
             )
 
-        entity_instruction = f"""
-**CRITICAL**: The document uses `[ENTITY:EXXX]` tags to mark entity boundaries.
-There are {len(chunk.entity_ids)} entities in this chunk: {', '.join(chunk.entity_ids)}.
-
-Rules for entity tags:
-- Every `[ENTITY:EXXX]` tag MUST appear in your output
-- When MERGING entities, keep only the FIRST entity's tag and DELETE the others
-- When NOT merging, keep each tag exactly where it is
-- NEVER remove ALL tags - at minimum, merged groups must retain one tag each
-
-Return the corrected document content followed by a `## Change Log` section.
-If no changes are needed, return the content as-is with an empty change log."""
+        user_message = f"""{ENTITY_TAG_INSTRUCTIONS}{context_note}
 
-        user_message = f"""{context_note}{entity_instruction}
+There are {len(chunk.entity_ids)} entities in this chunk: {', '.join(chunk.entity_ids)}.
 
 ---
 
 {chunk.content}"""
 
-        # Call LLM
-        response = client.chat.completions.create(
-            model=self.model,
-            messages=[
+        return {
+            "model": self.model,
+            "messages": [
                 {"role": "system", "content": self.judge_prompt},
                 {"role": "user", "content": user_message}
             ],
-            temperature=0.2,
-        )
+            "temperature": 0.2,
+        }
 
-        result = response.choices[0].message.content.strip()
+    def _parse_chunk_result(self, chunk: DocumentChunk, result: str) -> tuple[str, str]:
+        """
+        Turn the LLM's response for a chunk into corrected content (with full
+        markers restored) and its change log.
+        """
+        result = result.strip()
 
         # Strip outer code fences if LLM wrapped the response
         result = self._strip_code_fences(result)
@@ -304,27 +642,20 @@ If no changes are needed, return the content as-is with an empty change log."""
         If the LLM stripped placeholders, re-inject them at best-effort positions.
         Then replace all [ENTITY:EXXX] placeholders with full HTML comment markers.
         """
-        # Count how many placeholders survived
-        found_ids = re.findall(r'\[ENTITY:(E\d+)\]', content)
-        found_set = set(found_ids)
-        expected_set = set(expected_ids)
+        # Count how many placeholders survived (one pass over the content;
+        # missing IDs are kept in document order)
+        found_ids = {match.group(1) for match in _PLACEHOLDER_RE.finditer(content)}
+        expected = dict.fromkeys(expected_ids)
+        missing = [eid for eid in expected if eid not in found_ids]
 
-        surviving_count = len(found_set & expected_set)
-        total_expected = len(expected_set)
+        total_expected = len(expected)
+        surviving_count = total_expected - len(missing)
 
         if surviving_count == 0 and total_expected > 0:
             # LLM stripped ALL markers - this is a critical failure
             # Fall back: return original chunk content with full markers
             print(f"    WARNING: LLM removed ALL entity markers! Using original content.")
-            # Rebuild from marker_map
-            parts = []
-            for eid in expected_ids:
-                marker = self.marker_map.get(eid, f"<!-- Entity: {eid} -->")
-                parts.append(f"\n{marker}\n")
-                # Try to find corresponding content in the LLM output
-                # but since all markers are gone, we can't map reliably
-                # Fall back to original content would require storing it
-            # Since we can't recover, return original chunk content with real markers
+            # Since we can't map content back to entities, keep the LLM content
             restored = content
             # Prepend the first marker at minimum so the document isn't markerless
             first_marker = self.marker_map.get(expected_ids[0], '')
@@ -332,10 +663,9 @@ If no changes are needed, return the content as-is with an empty change log."""
                 restored = f"\n{first_marker}\n\n{content}\n"
             return restored
 
-        if surviving_count < total_expected:
-            missing = expected_set - found_set
+        if missing:
             print(f"    WARNING: {len(missing)} markers missing from LLM output: "
-                  f"{', '.join(sorted(missing))}. "
+                  f"{', '.join(missing)}. "
                   f"({surviving_count}/{total_expected} survived - merged or lost)")
 
         # Replace placeholders with full HTML comment markers
@@ -346,14 +676,13 @@ If no changes are needed, return the content as-is with an empty change log."""
                 return full_marker
             return match.group(0)  # Keep as-is if not in map
 
-        restored = re.sub(r'\[ENTITY:(E\d+)\]', replace_placeholder, content)
+        restored = _PLACEHOLDER_RE.sub(replace_placeholder, content)
 
         return restored
 
     def _strip_code_fences(self, text: str) -> str:
         """Strip outer markdown code fences if the LLM wrapped the entire response."""
-        pattern = r'^```(?:markdown|md)?\s*\n(.*?)```\s*$'
-        match = re.match(pattern, text, re.DOTALL)
+        match = _CODE_FENCE_RE.match(text)
         if match:
             return match.group(1).strip()
         return text
@@ -362,19 +691,12 @@ If no changes are needed, return the content as-is with an empty change log."""
         """
         Split LLM result into corrected content and change log.
         """
-        patterns = [
-            r'\n## Change Log\s*\n',
-            r'\n## Changelog\s*\n',
-            r'\n## Changes\s*\n',
-            r'\n---\s*\n## Change Log',
-        ]
-
-        for pattern in patterns:
-            match = re.search(pattern, result, re.IGNORECASE)
+        for pattern in _CHANGE_LOG_RES:
+            match = pattern.search(result)
             if match:
                 corrected = result[:match.start()].rstrip()
                 change_log = result[match.end():].strip()
-                change_log = re.sub(r'\n?```\s*$', '', change_log).strip()
+                change_log = _TRAILING_FENCE_RE.sub('', change_log).strip()
                 return corrected, change_log
 
         return result, ""
@@ -384,15 +706,23 @@ If no changes are needed, return the content as-is with an empty change log."""
         frontmatter: str,
         corrected_chunks: list[str],
         all_changes: list[str]
-    ) -> str:
-        """Reassemble the final document from frontmatter + corrected chunks."""
-        parts = [frontmatter]
-
-        for chunk_content in corrected_chunks:
-            parts.append(chunk_content)
+    ) -> None:
+        """
+        Reassemble the final document from frontmatter + corrected chunks and
+        write it to output_path.
 
+        Parts are streamed to the file one by one (newline-separated) rather
+        than joined into one document-sized string first.
+        """
+        parts = [frontmatter, *corrected_chunks]
         if all_changes:
             parts.append("\n\n---\n\n# Judge Change Log\n")
-            parts.append('\n'.join(all_changes))
-
-        return '\n'.join(parts) + '\n'
+            parts.extend(all_changes)
+
+        with open(self.output_path, 'w', encoding='utf-8', buffering=1 << 20) as out:
+            write = out.write
+            for i, part in enumerate(parts):
+                if i:
+                    write('\n')
+                write(part)
+            write('\n')
@@ -3,34 +3,183 @@ Document Processing Pipeline
 Main orchestrator for single-document processing
 """
 
+import logging
 import os
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
-from typing import List
+from typing import Iterator, List
 import yaml
 from datetime import datetime
 from docling.document_converter import DocumentConverter, PdfFormatOption
 from docling.datamodel.base_models import InputFormat
-from docling.datamodel.pipeline_options import PdfPipelineOptions, TableFormerMode
+from docling.datamodel.pipeline_options import (
+    AcceleratorDevice,
+    AcceleratorOptions,
+    PdfPipelineOptions,
+    TableFormerMode,
+)
 from docling.datamodel.document import ConversionResult
 from docling_core.types.doc import ImageRefMode, PictureItem, TableItem, TextItem
 import fitz  # PyMuPDF
-from PIL import Image
 
-from .pipeline_config import EntityType, PipelineConfig
+try:
+    import orjson
+except ImportError:  # Optional: fall back to the C YAML dumper
+    orjson = None
+
+from .pipeline_config import EntityType, ManifestDumper, PipelineConfig
 from .entity_classifier import EntityClassifier
 from .entity_processor import EntityProcessor, ProcessedEntity
 
 
+logger = logging.getLogger(__name__)
+
+
+# Docling converter settings used by DocumentPipeline:
+# (do_ocr, do_table_structure, do_cell_matching, images_scale,
+#  generate_page_images, generate_picture_images)
+_CONVERTER_OPTIONS = (True, True, True, 2.0, True, True)
+
+
+def _docling_threads() -> int:
+    """
+    CPU threads for Docling's models (layout, TableFormer, OCR). Docling uses 4
+    unless DOCLING_NUM_THREADS/OMP_NUM_THREADS say otherwise; use half the cores.
+    Read per pipeline, so values loaded from .env after import still apply.
+    """
+    return int(
+        os.getenv("DOCLING_NUM_THREADS") or os.getenv("OMP_NUM_THREADS")
+        or max(4, (os.cpu_count() or 8) // 2)
+    )
+
+
+_converter_lock = threading.Lock()
+
+# Entity processing calls (vision API) run concurrently on a thread pool of
+# this size (override with the PIPELINE_MAX_WORKERS env var)
+DEFAULT_MAX_WORKERS = 8
+
+# final_document.md is streamed through a buffer of this size. Entity content
+# is wrapped by type with these pre-encoded (opening, closing) delimiters;
+# text and other types are written as-is.
+_WRITE_BUFFER_SIZE = 1 << 20
+_CONTENT_WRAPPERS = {
+    EntityType.TABLE: (b"```yaml\n", b"\n```\n"),
+    EntityType.DIAGRAM: (b"```mermaid\n", b"\n```\n"),
+}
+_TEXT_WRAPPER = (b"", b"\n")
+
+# Table regions are rendered at 2x zoom for better quality
+_TABLE_MATRIX = fitz.Matrix(2, 2)
+
+# List-detection patterns, compiled once instead of on every Docling item.
+# Regular sentences (start with "The", "This", etc.) rather than list items
+_SENTENCE_LEAD_RE = re.compile(r'^(The|This|It|A|An|In|For|To|From|Furthermore)\s+\w+', re.IGNORECASE)
+_MERGE_SENTENCE_LEAD_RE = re.compile(r'^(The|This|It|A|An|In|For|To|From|Furthermore|Moreover)\s+\w+', re.IGNORECASE)
+_HEADER_SENTENCE_LEAD_RE = re.compile(r'^(The|This|It|A|An|In|For)\s+\w+', re.IGNORECASE)
+# Number prefix ("1.", "1.3") left after stripping "##" from a markdown header
+_NUMBER_DOT_RE = re.compile(r'^\d+\.')
+# Explicit bullet markers: with the trailing space for detection, bare for stripping
+_LIST_MARKERS = ('- ', '* ', '• ', '◦ ', '▪ ', '→ ')
+_BULLET_CHARS = ('-', '*', '•', '◦', '▪', '→')
+
+
+# How a text item starts, as far as list detection cares
+_PLAIN = 0
+_SECTION_HEADER = 1   # "1.2 APPLICATION", "## 1.2 APPLICATION", "## - 1.2 APPLICATION"
+_BULLET = 2           # one of _LIST_MARKERS
+_NUMBERED = 3         # "1. ", but not "1.1"
+_MARKDOWN_HEADER = 4  # "##" not followed by a section number
+
+# One alternation classifies the prefix in a single match. Alternatives are
+# tried in order, so section numbers win over bullets and "##" headers.
+_PREFIX_RE = re.compile(
+    r'(?P<section>#*\s*-?\s*\d+\.\d+)'
+    r'|(?P<bullet>' + '|'.join(map(re.escape, _LIST_MARKERS)) + r')'
+    r'|(?P<numbered>\d+\.\s)'
+    r'|(?P<header>##)'
+)
+_PREFIX_KINDS = {
+    'section': _SECTION_HEADER,
+    'bullet': _BULLET,
+    'numbered': _NUMBERED,
+    'header': _MARKDOWN_HEADER,
+}
+
+
+def _classify_prefix(text: str) -> int:
+    """Classify the start of text as one of the _PLAIN.._MARKDOWN_HEADER kinds"""
+    # Plain sentences, the common case, start with a letter and match no kind
+    if text[:1].isalpha():
+        return _PLAIN
+    match = _PREFIX_RE.match(text)
+    return _PREFIX_KINDS[match.lastgroup] if match else _PLAIN
+
+
+@lru_cache(maxsize=4)
+def _build_converter(options_key: tuple) -> DocumentConverter:
+    """Build a Docling converter for the given option fingerprint."""
+    (do_ocr, do_table_structure, do_cell_matching, images_scale,
+     generate_page_images, generate_picture_images,
+     table_mode, device, num_threads) = options_key
+
+    pipeline_options = PdfPipelineOptions()
+    pipeline_options.accelerator_options = AcceleratorOptions(num_threads=num_threads, device=device)
+    pipeline_options.do_table_structure = do_table_structure
+    pipeline_options.do_ocr = do_ocr
+    pipeline_options.table_structure_options.mode = table_mode
+    pipeline_options.table_structure_options.do_cell_matching = do_cell_matching
+    pipeline_options.images_scale = images_scale
+    pipeline_options.generate_page_images = generate_page_images
+    pipeline_options.generate_picture_images = generate_picture_images
+
+    return DocumentConverter(
+        format_options={
+            InputFormat.PDF: PdfFormatOption(pipeline_options=pipeline_options)
+        }
+    )
+
+
+def _get_converter(options_key: tuple) -> DocumentConverter:
+    """
+    Return the process-wide Docling converter for these options.
+
+    The converter keeps its initialized pipeline (layout, TableFormer and OCR
+    models) between conversions, so sharing it means the models are loaded
+    once per process instead of once per DocumentPipeline.
+    """
+    with _converter_lock:
+        return _build_converter(options_key)
+
+
+def clear_converter_cache() -> None:
+    """Drop the cached Docling converters (and the models they hold)."""
+    with _converter_lock:
+        _build_converter.cache_clear()
+
+
 class DocumentPipeline:
     """Single-document processing pipeline"""
 
-    def __init__(self, openai_api_key: str | None = None):
+    def __init__(
+        self,
+        openai_api_key: str | None = None,
+        table_mode: TableFormerMode = TableFormerMode.ACCURATE,
+        device: AcceleratorDevice = AcceleratorDevice.AUTO
+    ):
         """
         Initialize pipeline
 
         Args:
             openai_api_key: OpenAI API key for vision processing.
                            If None, will try to read from environment.
+            table_mode: TableFormer mode; FAST is 2-3x quicker on table-heavy
+                        documents at some cost in cell accuracy.
+            device: Device for Docling's models. AUTO picks CUDA, then MPS,
+                    and falls back to CPU.
         """
         self.config = PipelineConfig()
 
@@ -44,21 +193,8 @@ class DocumentPipeline:
         self.classifier = EntityClassifier(openai_api_key)
         self.processor = EntityProcessor(self.classifier)
 
-        # Initialize Docling converter
-        pipeline_options = PdfPipelineOptions()
-        pipeline_options.do_table_structure = True
-        pipeline_options.do_ocr = True
-        pipeline_options.table_structure_options.mode = TableFormerMode.ACCURATE
-        pipeline_options.table_structure_options.do_cell_matching = True
-        pipeline_options.images_scale = 2.0
-        pipeline_options.generate_page_images = True
-        pipeline_options.generate_picture_images = True
-
-        self.converter = DocumentConverter(
-            format_options={
-                InputFormat.PDF: PdfFormatOption(pipeline_options=pipeline_options)
-            }
-        )
+        # Docling converter, shared with other pipelines in this process
+        self.converter = _get_converter((*_CONVERTER_OPTIONS, table_mode, device, _docling_threads()))
 
     def process_document(self, pdf_path: str | Path, output_dir: str | Path = "output") -> Path:
         """
@@ -100,17 +236,20 @@ class DocumentPipeline:
             entity_files.append(filepath)
             print(f"  Saved: {filepath.name}")
 
-        # Step 4: Assemble final document
+        # Step 4/5: Assemble final document and create manifest (independent
+        # writes, so they overlap)
         print("Step 4: Assembling final document...")
-        final_doc_path = self._assemble_final_document(
-            entities,
-            output_dir,
-            pdf_path.name
-        )
-
-        # Step 5: Create manifest
         print("Step 5: Creating manifest...")
-        self._create_manifest(entities, output_dir, pdf_path.name)
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            final_doc_future = executor.submit(
+                self._assemble_final_document,
+                entities,
+                output_dir,
+                pdf_path.name
+            )
+            manifest_future = executor.submit(self._create_manifest, entities, output_dir, pdf_path.name)
+            final_doc_path = final_doc_future.result()
+            manifest_future.result()
 
         print(f"\n✓ Processing complete!")
         print(f"  - {len(entities)} entities extracted")
@@ -121,19 +260,29 @@ class DocumentPipeline:
 
     def _extract_table_region_image(
         self,
-        pdf_path: Path,
+        pdf_doc: fitz.Document,
         page_num: int,
         bbox: list[float],
         entity_id: str,
-        output_dir: Path
+        output_dir: Path,
+        page_cache: dict | None = None
     ) -> Path | None:
-        """Extract table region from PDF page using PyMuPDF"""
-        try:
-            # Open PDF with PyMuPDF
-            pdf_doc = fitz.open(str(pdf_path))
+        """
+        Extract table region from an open PDF using PyMuPDF
 
+        The caller owns pdf_doc. Pages and their rects are looked up in
+        page_cache (keyed by 1-based page number) so several tables on one
+        page load it once.
+        """
+        try:
             # Get page (convert 1-based to 0-based index)
-            page = pdf_doc[page_num - 1]
+            cached = page_cache.get(page_num) if page_cache is not None else None
+            if cached is None:
+                page = pdf_doc[page_num - 1]
+                cached = (page, page.rect)
+                if page_cache is not None:
+                    page_cache[page_num] = cached
+            page, page_rect = cached
 
             # Transform PDF coordinates to PyMuPDF rect
             # Docling bbox: [left, top, right, bottom] - top-left origin
@@ -142,7 +291,7 @@ class DocumentPipeline:
 
             # Docling's top > bottom in PDF coordinate space (bottom-left origin)
             # But when rendering, we need to use page coordinate space (top-left origin)
-            page_height = page.rect.height
+            page_height = page_rect.height
 
             # Transform to page rendering coordinates
             left = bbox[0]
@@ -161,26 +310,20 @@ class DocumentPipeline:
             # Create rectangle for cropping
             rect = fitz.Rect(left, top_render, right, bottom_render)
 
-            print(f"    [DEBUG] Page size: {page.rect.width}x{page.rect.height}")
-            print(f"    [DEBUG] Crop rect: {rect}")
+            logger.debug("    [DEBUG] Page size: %sx%s", page_rect.width, page_rect.height)
+            logger.debug("    [DEBUG] Crop rect: %s", rect)
 
             # Render page to pixmap at high resolution
-            mat = fitz.Matrix(2, 2)  # 2x zoom for better quality
-            pix = page.get_pixmap(matrix=mat, clip=rect)
-
-            # Convert to PIL Image
-            img_data = pix.tobytes("png")
-            from io import BytesIO
-            pil_image = Image.open(BytesIO(img_data))
+            pix = page.get_pixmap(matrix=_TABLE_MATRIX, clip=rect)
 
-            print(f"    [DEBUG] Extracted image: {pil_image.width}x{pil_image.height}")
+            logger.debug("    [DEBUG] Extracted image: %sx%s", pix.width, pix.height)
 
-            # Save
+            # Save (PyMuPDF encodes the PNG itself, no PIL round-trip)
             temp_path = output_dir / f"temp_table_{entity_id}.png"
-            pil_image.save(temp_path)
-            print(f"    [DEBUG] Saved to: {temp_path}")
+            pix.save(str(temp_path), output="png")
+            del pix  # release the MuPDF pixmap before the vision call
+            logger.debug("    [DEBUG] Saved to: %s", temp_path)
 
-            pdf_doc.close()
             return temp_path
 
         except Exception as e:
@@ -190,9 +333,8 @@ class DocumentPipeline:
             return None
 
     def _is_list_intro(self, text: str) -> bool:
-        """Check if text introduces a list (ends with colon)"""
-        text = text.strip()
-        return text.endswith(':') and len(text) > 10
+        """Check if (already stripped) text introduces a list (ends with colon)"""
+        return len(text) > 10 and text.endswith(':')
 
     def _is_list_item(self, text: str, bbox: list[float] | None, prev_bbox: list[float] | None, after_colon: bool = False) -> bool:
         """
@@ -202,47 +344,47 @@ class DocumentPipeline:
         - Has indentation from left margin
         - Has list markers (-, *, •, ##, numbers)
         - Following a sentence that ends with ":"
+
+        Like the other list checks, expects text already stripped by the
+        document walk.
         """
         if not text or not bbox:
             return False
 
-        text = text.strip()
-
-        import re
+        prefix = _classify_prefix(text)
 
         # CRITICAL: Exclude section headers with numbers (1.2, 1.3.1, etc.)
         # Check if text starts with section number pattern (with or without ##)
         # Match: "1.2 APPLICATION", "## 1.2 APPLICATION", "## - 1.2 APPLICATION"
-        if re.match(r'^#*\s*-?\s*\d+\.\d+', text):
-            return False
-
-        # Exclude sentences that look like regular text (start with "The", "This", etc.)
-        # UNLESS we're after a colon (list intro)
-        if not after_colon and re.match(r'^(The|This|It|A|An|In|For|To|From|Furthermore)\s+\w+', text, re.IGNORECASE):
+        if prefix == _SECTION_HEADER:
             return False
 
         # Check for explicit list markers
-        list_markers = ['- ', '* ', '• ', '◦ ', '▪ ', '→ ']
-        if any(text.startswith(marker) for marker in list_markers):
+        if prefix == _BULLET:
             return True
 
         # Check for numbered lists (1., 2., etc.) - but not section numbers (1.1, 1.2)
-        if re.match(r'^\d+\.\s', text) and not re.match(r'^\d+\.\d+', text):
+        if prefix == _NUMBERED:
             return True
 
         # Check for markdown headers used as list items (##)
         # But only if they don't look like section headers or regular text
-        if text.startswith('##'):
+        if prefix == _MARKDOWN_HEADER:
             # Remove ## and check content
             content = text.replace('##', '').strip().lstrip('-').strip()
             # If it starts with a number pattern like "1.3", it's a header not a list
-            if re.match(r'^\d+\.', content):
+            if _NUMBER_DOT_RE.match(content):
                 return False
             # If it looks like regular text, not a list
-            if not after_colon and re.match(r'^(The|This|It|A|An|In|For)\s+\w+', content, re.IGNORECASE):
+            if not after_colon and _HEADER_SENTENCE_LEAD_RE.match(content):
                 return False
             return True
 
+        # Exclude sentences that look like regular text (start with "The", "This", etc.)
+        # UNLESS we're after a colon (list intro). Only plain text can start with a word.
+        if not after_colon and _SENTENCE_LEAD_RE.match(text):
+            return False
+
         # Check for indented short items (likely list titles/items)
         left_indent = bbox[0]
 
@@ -253,8 +395,8 @@ class DocumentPipeline:
         # Otherwise, standard check
         if left_indent > 85 and left_indent < 110:  # Common list indentation range
             # Short text (< 100 chars) with indentation is likely a list item
-            # But exclude if it looks like a section header
-            if len(text) < 100 and not re.match(r'^\d+\.\d+', text):
+            # (section headers were already excluded above)
+            if len(text) < 100:
                 return True
 
         return False
@@ -277,23 +419,15 @@ class DocumentPipeline:
         if not list_items or not current_bbox:
             return False
 
-        import re
-
-        text = current_text.strip()
+        # Item texts are stripped when they are read from Docling
+        text = current_text
 
         # Check if list started with a colon (intro text)
-        first_item_text = list_items[0].get('text', '').strip()
+        first_item_text = list_items[0].get('text', '')
         after_colon = first_item_text.endswith(':')
 
-        # NEVER merge these with lists:
-        # 1. Section headers (1.2, 1.3.1, etc.)
-        if re.match(r'^#*\s*-?\s*\d+\.\d+', text):
-            return False
-
-        # 2. Regular sentences starting with common words (UNLESS after colon)
-        if not after_colon and re.match(r'^(The|This|It|A|An|In|For|To|From|Furthermore|Moreover)\s+\w+', text, re.IGNORECASE):
-            return False
-
+        # Cheap numeric checks first: every rejection below is independent,
+        # so items on another page or far from the list skip the text checks
         last_item = list_items[-1]
         last_bbox = last_item.get('bbox')
         last_page = last_item.get('page')
@@ -309,6 +443,15 @@ class DocumentPipeline:
             if vertical_gap > max_gap:
                 return False
 
+        # NEVER merge these with lists:
+        # 1. Section headers (1.2, 1.3.1, etc.)
+        if _classify_prefix(text) == _SECTION_HEADER:
+            return False
+
+        # 2. Regular sentences starting with common words (UNLESS after colon)
+        if not after_colon and _MERGE_SENTENCE_LEAD_RE.match(text):
+            return False
+
         # Check if it's a list item (pass after_colon context)
         if self._is_list_item(current_text, current_bbox, last_bbox, after_colon):
             return True
@@ -337,7 +480,7 @@ class DocumentPipeline:
         is_first = True
 
         for item in list_items:
-            text = item['text'].strip()
+            text = item['text']
             indent = item.get('bbox', [0])[0]
 
             # Step 1: Remove ALL markdown formatting and bullet markers
@@ -346,7 +489,7 @@ class DocumentPipeline:
                 text = text[2:].lstrip()
 
             # Remove bullet markers
-            if text.startswith(('-', '*', '•', '◦', '▪', '→')):
+            if text.startswith(_BULLET_CHARS):
                 text = text[1:].lstrip()
 
             # Step 2: Add clean formatting based on content type
@@ -365,6 +508,26 @@ class DocumentPipeline:
 
         return '\n'.join(merged_lines)
 
+    def _flush_list_buffer(self, list_buffer: list, entity_counter: int) -> Iterator[tuple]:
+        """
+        Yield buffered list items as one merged text entity task
+
+        Empties list_buffer. Use with `yield from`, which evaluates to the
+        next entity counter (unchanged when there was nothing to flush).
+        """
+        if list_buffer:
+            first_item = list_buffer[0]
+            yield (self.processor.process_text_block, dict(
+                text=self._merge_list_items(list_buffer),
+                entity_id=f"E{entity_counter:03d}",
+                page_num=first_item['page'],
+                position=entity_counter,
+                bbox=first_item['bbox']
+            ))
+            list_buffer.clear()
+            entity_counter += 1
+        return entity_counter
+
     def _extract_entities(
         self,
         doc,
@@ -374,179 +537,170 @@ class DocumentPipeline:
     ) -> List[ProcessedEntity]:
         """Extract all entities from Docling document"""
 
-        entities = []
+        # Vision/LLM calls are network-bound, so overlap them on a thread
+        # pool. Tasks are submitted as the document walk produces them, and
+        # results are collected in submission (document) order.
+        temp_images = []
+        max_workers = int(os.getenv("PIPELINE_MAX_WORKERS", DEFAULT_MAX_WORKERS))
+        try:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                futures = [
+                    executor.submit(method, **kwargs)
+                    for method, kwargs in self._entity_tasks(doc, pdf_path, entities_dir, temp_images)
+                ]
+                entities = [future.result() for future in futures]
+        finally:
+            for path in temp_images:
+                if path.exists():
+                    path.unlink()
+
+        return entities
+
+    def _entity_tasks(
+        self,
+        doc,
+        pdf_path: Path,
+        entities_dir: Path,
+        temp_images: list[Path]
+    ) -> Iterator[tuple]:
+        """
+        Walk the Docling document and yield processor calls in document order
+
+        Each task is (processor method, keyword arguments). Temp table crops
+        are appended to temp_images for the caller to remove once every task
+        has run.
+        """
         entity_counter = 1
 
         # Buffer for collecting list items
         list_buffer = []
         prev_bbox = None
 
-        # Iterate through document items using Docling 2.x API
-        for item, level in doc.iterate_items():
-
-            entity_id = f"E{entity_counter:03d}"
-
-            # Get page number and bounding box from provenance
-            page_num = 1  # default
-            bbox = None
-            if hasattr(item, 'prov') and item.prov:
-                page_num = item.prov[0].page_no
-                bbox = [
-                    item.prov[0].bbox.l,
-                    item.prov[0].bbox.t,
-                    item.prov[0].bbox.r,
-                    item.prov[0].bbox.b
-                ]
+        # PDF handle for table-region crops, opened on the first table and
+        # shared by every table in the document
+        pdf_doc = None
+        pdf_pages = {}
 
-            # Process based on item type
-            if isinstance(item, TextItem):
-                text = item.text.strip()
-
-                # Check if this should be part of a list
-                is_list_intro = self._is_list_intro(text)
-                is_list_item_check = self._is_list_item(text, bbox, prev_bbox)
-                should_merge = self._should_merge_with_list(text, bbox, list_buffer, page_num)
-
-                if is_list_intro or is_list_item_check or should_merge:
-                    # Add to list buffer (including intro sentences ending with :)
-                    list_buffer.append({
-                        'text': text,
-                        'bbox': bbox,
-                        'page': page_num
-                    })
-                    prev_bbox = bbox
-                else:
-                    # Not a list item - flush any buffered list first
-                    if list_buffer:
-                        # Create merged list entity
-                        merged_text = self._merge_list_items(list_buffer)
-                        first_item = list_buffer[0]
-                        entity = self.processor.process_text_block(
-                            text=merged_text,
+        # Bind per-item lookups to locals for the loop
+        is_list_intro = self._is_list_intro
+        is_list_item = self._is_list_item
+        should_merge_with_list = self._should_merge_with_list
+        process_text_block = self.processor.process_text_block
+        text_item, table_item, picture_item = TextItem, TableItem, PictureItem
+
+        try:
+            # Iterate through document items using Docling 2.x API
+            for item, level in doc.iterate_items():
+
+                entity_id = f"E{entity_counter:03d}"
+
+                # Get page number and bounding box from provenance
+                page_num = 1  # default
+                bbox = None
+                prov = getattr(item, 'prov', None)
+                if prov:
+                    page_num = prov[0].page_no
+                    box = prov[0].bbox
+                    bbox = [box.l, box.t, box.r, box.b]
+
+                # Process based on item type
+                if isinstance(item, text_item):
+                    text = item.text.strip()
+
+                    # Check if this should be part of a list (the checks have
+                    # no side effects, so stop at the first that matches)
+                    if (is_list_intro(text)
+                            or is_list_item(text, bbox, prev_bbox)
+                            or should_merge_with_list(text, bbox, list_buffer, page_num)):
+                        # Add to list buffer (including intro sentences ending with :)
+                        list_buffer.append({
+                            'text': text,
+                            'bbox': bbox,
+                            'page': page_num
+                        })
+                        prev_bbox = bbox
+                    else:
+                        # Not a list item - flush any buffered list first
+                        if list_buffer:
+                            # Create merged list entity
+                            entity_counter = yield from self._flush_list_buffer(list_buffer, entity_counter)
+                            entity_id = f"E{entity_counter:03d}"
+
+                        # Process current item as regular text
+                        yield (process_text_block, dict(
+                            text=text,
                             entity_id=entity_id,
-                            page_num=first_item['page'],
+                            page_num=page_num,
                             position=entity_counter,
-                            bbox=first_item['bbox']
-                        )
-                        entities.append(entity)
+                            bbox=bbox
+                        ))
                         entity_counter += 1
+                        prev_bbox = bbox
+
+                elif isinstance(item, table_item):
+                    # Flush any buffered list items before processing table
+                    if list_buffer:
+                        entity_counter = yield from self._flush_list_buffer(list_buffer, entity_counter)
                         entity_id = f"E{entity_counter:03d}"
-                        list_buffer = []
+                        prev_bbox = None
+                    # Step 1: Try Docling extraction
+                    table_md = item.export_to_markdown()
+
+                    # Table processing
+                    # Step 2: Prepare fallback image if bbox available
+                    table_region_path = None
+                    if bbox:
+                        logger.debug("  [DEBUG %s] Extracting table region with bbox: %s", entity_id, bbox)
+                        if pdf_doc is None:
+                            pdf_doc = fitz.open(str(pdf_path))
+                        table_region_path = self._extract_table_region_image(
+                            pdf_doc, page_num, bbox, entity_id, entities_dir, pdf_pages
+                        )
+                        logger.debug("  [DEBUG %s] Table region path: %s", entity_id, table_region_path)
+                    else:
+                        logger.debug("  [DEBUG %s] No bbox available for table region extraction", entity_id)
 
-                    # Process current item as regular text
-                    entity = self.processor.process_text_block(
-                        text=text,
-                        entity_id=entity_id,
-                        page_num=page_num,
-                        position=entity_counter,
-                        bbox=bbox
-                    )
-                    entities.append(entity)
-                    entity_counter += 1
-                    prev_bbox = bbox
-
-            elif isinstance(item, TableItem):
-                # Flush any buffered list items before processing table
-                if list_buffer:
-                    merged_text = self._merge_list_items(list_buffer)
-                    first_item = list_buffer[0]
-                    entity = self.processor.process_text_block(
-                        text=merged_text,
-                        entity_id=entity_id,
-                        page_num=first_item['page'],
-                        position=entity_counter,
-                        bbox=first_item['bbox']
-                    )
-                    entities.append(entity)
-                    entity_counter += 1
-                    entity_id = f"E{entity_counter:03d}"
-                    list_buffer = []
-                    prev_bbox = None
-                # Step 1: Try Docling extraction
-                table_md = item.export_to_markdown()
-
-                # Table processing
-                # Step 2: Prepare fallback image if bbox available
-                table_region_path = None
-                if bbox:
-                    print(f"  [DEBUG {entity_id}] Extracting table region with bbox: {bbox}")
-                    table_region_path = self._extract_table_region_image(
-                        pdf_path, page_num, bbox, entity_id, entities_dir
-                    )
-                    print(f"  [DEBUG {entity_id}] Table region path: {table_region_path}")
-                else:
-                    print(f"  [DEBUG {entity_id}] No bbox available for table region extraction")
-
-                # Step 3: Process with fallback option
-                entity = self.processor.process_table(
-                    table_data=table_md,
-                    entity_id=entity_id,
-                    page_num=page_num,
-                    position=entity_counter,
-                    bbox=bbox,
-                    fallback_image_path=table_region_path
-                )
-                entities.append(entity)
-                entity_counter += 1
-                prev_bbox = None  # Reset for next items
-
-                # Step 4: Cleanup temp image
-                if table_region_path and table_region_path.exists():
-                    table_region_path.unlink()
-
-            elif isinstance(item, PictureItem):
-                # Flush any buffered list items before processing picture
-                if list_buffer:
-                    merged_text = self._merge_list_items(list_buffer)
-                    first_item = list_buffer[0]
-                    entity = self.processor.process_text_block(
-                        text=merged_text,
-                        entity_id=entity_id,
-                        page_num=first_item['page'],
-                        position=entity_counter,
-                        bbox=first_item['bbox']
-                    )
-                    entities.append(entity)
-                    entity_counter += 1
-                    entity_id = f"E{entity_counter:03d}"
-                    list_buffer = []
-                    prev_bbox = None
-                # Image/Picture - need to extract and process
-                # Save image temporarily
-                if item.image:
-                    temp_image_path = entities_dir / f"temp_{entity_id}.png"
-                    item.image.pil_image.save(temp_image_path)
-
-                    # Process image with vision API
-                    entity = self.processor.process_image(
-                        image_path=temp_image_path,
+                    # Step 3: Process with fallback option
+                    yield (self.processor.process_table, dict(
+                        table_data=table_md,
                         entity_id=entity_id,
                         page_num=page_num,
                         position=entity_counter,
-                        bbox=bbox
-                    )
-                    entities.append(entity)
+                        bbox=bbox,
+                        fallback_image_path=table_region_path
+                    ))
                     entity_counter += 1
                     prev_bbox = None  # Reset for next items
 
-                    # Clean up temp image
-                    temp_image_path.unlink()
+                    # Step 4: Cleanup temp image once the table has been processed
+                    if table_region_path:
+                        temp_images.append(table_region_path)
 
-        # Flush any remaining list items at end of document
-        if list_buffer:
-            entity_id = f"E{entity_counter:03d}"
-            merged_text = self._merge_list_items(list_buffer)
-            first_item = list_buffer[0]
-            entity = self.processor.process_text_block(
-                text=merged_text,
-                entity_id=entity_id,
-                page_num=first_item['page'],
-                position=entity_counter,
-                bbox=first_item['bbox']
-            )
-            entities.append(entity)
+                elif isinstance(item, picture_item):
+                    # Flush any buffered list items before processing picture
+                    if list_buffer:
+                        entity_counter = yield from self._flush_list_buffer(list_buffer, entity_counter)
+                        entity_id = f"E{entity_counter:03d}"
+                        prev_bbox = None
+                    # Image/Picture - Docling already holds it as a PIL image,
+                    # so hand it to the vision API without a temp file
+                    if item.image:
+                        yield (self.processor.process_image_pil, dict(
+                            pil_image=item.image.pil_image,
+                            entity_id=entity_id,
+                            page_num=page_num,
+                            position=entity_counter,
+                            bbox=bbox
+                        ))
+                        entity_counter += 1
+                        prev_bbox = None  # Reset for next items
+        finally:
+            if pdf_doc is not None:
+                pdf_doc.close()
+                fitz.TOOLS.store_shrink(100)
 
-        return entities
+        # Flush any remaining list items at end of document
+        yield from self._flush_list_buffer(list_buffer, entity_counter)
 
     def _assemble_final_document(
         self,
@@ -570,34 +724,26 @@ source_file: "{source_filename}"
 
 """
 
-        # Assemble entities
-        content_parts = [header]
-
-        for entity in entities:
-            # Add entity marker
-            marker = self.config.ENTITY_MARKER_TEMPLATE.format(
-                entity_id=entity.metadata['entity_id'],
-                type=entity.metadata['type'],
-                page=entity.metadata['source_page']
-            )
-            content_parts.append(f"\n{marker}\n")
-
-            # Add entity content with appropriate formatting
-            if entity.metadata['type'] == EntityType.TABLE:
-                content_parts.append(f"```yaml\n{entity.content}\n```\n")
-
-            elif entity.metadata['type'] == EntityType.DIAGRAM:
-                content_parts.append(f"```mermaid\n{entity.content}\n```\n")
-
-            else:
-                # Text content
-                content_parts.append(f"{entity.content}\n")
-
-        final_content = '\n'.join(content_parts)
-
-        # Write final document
+        # Stream header and entities straight into a buffered binary file,
+        # one blank line between parts, instead of joining the whole document
         final_path = output_dir / "final_document.md"
-        final_path.write_text(final_content, encoding='utf-8')
+        with final_path.open('wb', buffering=_WRITE_BUFFER_SIZE) as f:
+            f.write(header.encode('utf-8'))
+
+            for entity in entities:
+                # Add entity marker
+                marker = self.config.ENTITY_MARKER_TEMPLATE.format(
+                    entity_id=entity.metadata['entity_id'],
+                    type=entity.metadata['type'],
+                    page=entity.metadata['source_page']
+                )
+                f.write(f"\n\n{marker}\n\n".encode('utf-8'))
+
+                # Add entity content with appropriate formatting
+                opening, closing = _CONTENT_WRAPPERS.get(entity.metadata['type'], _TEXT_WRAPPER)
+                f.write(opening)
+                f.write(entity.content.encode('utf-8'))
+                f.write(closing)
 
         return final_path
 
@@ -636,9 +782,16 @@ source_file: "{source_filename}"
                 "file": f"entities/{entity.metadata['entity_id']}_{entity.metadata['type']}{entity.file_extension}"
             })
 
-        # Write manifest
+        # Write manifest. JSON is valid YAML, so with orjson the manifest is
+        # emitted as indented JSON (entity types as plain strings) and every
+        # YAML reader still loads it.
         manifest_path = output_dir / "manifest.yaml"
-        with open(manifest_path, 'w', encoding='utf-8') as f:
-            yaml.dump(manifest, f, default_flow_style=False, sort_keys=False)
+        if orjson is not None:
+            manifest_path.write_bytes(
+                orjson.dumps(manifest, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS) + b"\n"
+            )
+        else:
+            with open(manifest_path, 'w', encoding='utf-8') as f:
+                yaml.dump(manifest, f, Dumper=ManifestDumper, default_flow_style=False, sort_keys=False)
 
         print(f"  Manifest saved: {manifest_path}")
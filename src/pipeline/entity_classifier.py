@@ -5,6 +5,7 @@ Uses OpenAI Vision API to classify and analyze images
 
 import base64
 import json
+import math
 from pathlib import Path
 from typing import Tuple
 from openai import OpenAI
@@ -20,12 +21,12 @@ class EntityClassifier:
         self.client = OpenAI(api_key=api_key)
         self.config = PipelineConfig()
 
-    def classify_image(self, image_path: str | Path) -> Tuple[EntityType, float, dict]:
+    def classify_image(self, image_path: str | Path | Image.Image) -> Tuple[EntityType, float, dict]:
         """
         Classify an image to determine its content type
 
         Args:
-            image_path: Path to image file
+            image_path: Path to image file, or an in-memory PIL image
 
         Returns:
             Tuple of (EntityType, confidence, metadata_dict)
@@ -62,7 +63,7 @@ class EntityClassifier:
 
         return entity_type, confidence, result
 
-    def extract_text(self, image_path: str | Path) -> str:
+    def extract_text(self, image_path: str | Path | Image.Image) -> str:
         """Extract text from an image"""
         image_data = self._encode_image(image_path)
 
@@ -87,7 +88,7 @@ class EntityClassifier:
 
         return response.choices[0].message.content.strip()
 
-    def extract_table(self, image_path: str | Path) -> str:
+    def extract_table(self, image_path: str | Path | Image.Image) -> str:
         """Extract table from an image and convert to YAML"""
         image_data = self._encode_image(image_path)
 
@@ -120,7 +121,7 @@ class EntityClassifier:
 
         return content
 
-    def extract_diagram(self, image_path: str | Path) -> dict:
+    def extract_diagram(self, image_path: str | Path | Image.Image) -> dict:
         """Extract diagram from an image and convert to Mermaid, plus surrounding text"""
         image_data = self._encode_image(image_path)
 
@@ -158,7 +159,7 @@ class EntityClassifier:
                 content = content.replace("```", "").strip()
             return {"surrounding_text": "", "diagram": content}
 
-    def extract_mixed_content(self, image_path: str | Path, primary_type: str) -> dict:
+    def extract_mixed_content(self, image_path: str | Path | Image.Image, primary_type: str) -> dict:
         """
         Extract both text and structured content (diagram/table) from mixed images
 
@@ -209,23 +210,24 @@ Return JSON:
         result = json.loads(response.choices[0].message.content)
         return result
 
-    def _encode_image(self, image_path: str | Path) -> str:
-        """Encode image to base64 string"""
+    def _encode_image(self, image_path: str | Path | Image.Image) -> str:
+        """Encode image (file path or in-memory PIL image) to base64 string"""
         # Open and potentially resize image if too large
-        img = Image.open(image_path)
+        img = image_path if isinstance(image_path, Image.Image) else Image.open(image_path)
 
-        # Resize if larger than 2000px on either dimension
+        # Resize if larger than 2000px on either dimension, or than the
+        # configured pixel budget overall
         max_size = 2000
-        if img.width > max_size or img.height > max_size:
-            ratio = min(max_size / img.width, max_size / img.height)
-            new_size = (int(img.width * ratio), int(img.height * ratio))
+        ratio = min(1.0, max_size / img.width, max_size / img.height,
+                    math.sqrt(self.config.IMAGE_BUDGET_PIXELS / (img.width * img.height)))
+        if ratio < 1.0:
+            new_size = (max(1, int(img.width * ratio)), max(1, int(img.height * ratio)))
             img = img.resize(new_size, Image.Resampling.LANCZOS)
 
         # Convert to JPEG and encode
         buffer = io.BytesIO()
         if img.mode in ('RGBA', 'LA', 'P'):
             img = img.convert('RGB')
-        img.save(buffer, format="JPEG", quality=95)
-        buffer.seek(0)
+        img.save(buffer, format="JPEG", quality=self.config.VISION_JPEG_QUALITY, optimize=True)
 
-        return base64.b64encode(buffer.read()).decode('utf-8')
+        return base64.b64encode(buffer.getbuffer()).decode('ascii')
@@ -3,16 +3,20 @@ Entity Processor
 Converts document entities to standardized formats
 """
 
+import logging
 import yaml
 from pathlib import Path
 from typing import Any
 from dataclasses import dataclass, asdict
+from PIL import Image
 
 from .pipeline_config import EntityType, EntityMetadata, PipelineConfig
 from .entity_classifier import EntityClassifier
 
+logger = logging.getLogger(__name__)
 
-@dataclass
+
+@dataclass(slots=True)
 class ProcessedEntity:
     """Represents a processed document entity"""
     metadata: EntityMetadata
@@ -79,10 +83,10 @@ class EntityProcessor:
         )
 
         # DEBUG: Log validation results
-        print(f"  [DEBUG {entity_id}] Validation: is_valid={is_valid}, reason='{validation_reason}'")
-        print(f"  [DEBUG {entity_id}] Fallback path available: {fallback_image_path is not None}")
+        logger.debug("  [DEBUG %s] Validation: is_valid=%s, reason='%s'", entity_id, is_valid, validation_reason)
+        logger.debug("  [DEBUG %s] Fallback path available: %s", entity_id, fallback_image_path is not None)
         if not is_valid:
-            print(f"  [DEBUG {entity_id}] YAML preview: {yaml_content[:200]}")
+            logger.debug("  [DEBUG %s] YAML preview: %s", entity_id, yaml_content[:200])
 
         # Track extraction metadata
         extraction_method = "docling"
@@ -143,6 +147,28 @@ class EntityProcessor:
         bbox: list[float] | None = None
     ) -> ProcessedEntity:
         """Process an image and convert to appropriate format, extracting all content"""
+        return self._process_image(image_path, entity_id, page_num, position, bbox)
+
+    def process_image_pil(
+        self,
+        pil_image: Image.Image,
+        entity_id: str,
+        page_num: int,
+        position: int,
+        bbox: list[float] | None = None
+    ) -> ProcessedEntity:
+        """Process an in-memory PIL image (e.g. a Docling picture) without a temp file"""
+        return self._process_image(pil_image, entity_id, page_num, position, bbox)
+
+    def _process_image(
+        self,
+        image_path: Path | Image.Image,
+        entity_id: str,
+        page_num: int,
+        position: int,
+        bbox: list[float] | None
+    ) -> ProcessedEntity:
+        """Classify and extract an image given as a file path or a PIL image"""
 
         # Step 1: Classify image
         entity_type, confidence, classification = self.classifier.classify_image(image_path)
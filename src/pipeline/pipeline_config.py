@@ -6,6 +6,11 @@ Defines output formats and entity types
 from enum import Enum
 from typing import TypedDict, Literal
 
+try:
+    from yaml import CSafeLoader as _SafeLoader, CSafeDumper as _SafeDumper
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeLoader as _SafeLoader, SafeDumper as _SafeDumper
+
 class EntityType(str, Enum):
     TEXT = "text"
     TABLE = "table"
@@ -14,6 +19,29 @@ class EntityType(str, Enum):
     FORM = "form"
     MIXED = "mixed"
 
+# Without orjson, entity types are written to manifest.yaml as Python object
+# tags (JSON manifests hold them as plain strings). Handle
+# exactly that tag so manifests can use the (C) safe loader/dumper instead of
+# the pure-Python unsafe yaml.Loader/yaml.Dumper.
+ENTITY_TYPE_TAG = (
+    f"tag:yaml.org,2002:python/object/apply:{EntityType.__module__}.{EntityType.__qualname__}"
+)
+
+class ManifestLoader(_SafeLoader):
+    """Safe YAML loader that also constructs EntityType tags"""
+
+class ManifestDumper(_SafeDumper):
+    """Safe YAML dumper that writes EntityType in the pipeline's tag format"""
+
+ManifestLoader.add_constructor(
+    ENTITY_TYPE_TAG,
+    lambda loader, node: EntityType(*loader.construct_sequence(node))
+)
+ManifestDumper.add_representer(
+    EntityType,
+    lambda dumper, data: dumper.represent_sequence(ENTITY_TYPE_TAG, [data.value])
+)
+
 class EntityMetadata(TypedDict):
     entity_id: str
     type: EntityType
@@ -46,6 +74,12 @@ class PipelineConfig:
     VISION_MODEL = "gpt-4o"  # Using the latest model with vision
     VISION_MAX_TOKENS = 4096
 
+    # Vision payloads: images are downscaled to at most this many pixels and
+    # sent as JPEG. The API already resizes high-detail images to fit
+    # 2048x768 before the model sees them, so larger uploads only cost time.
+    IMAGE_BUDGET_PIXELS = 2048 * 768
+    VISION_JPEG_QUALITY = 85
+
     # Image classification prompt
     CLASSIFY_PROMPT = """Analyze this image and classify its PRIMARY content type.
 
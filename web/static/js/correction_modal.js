@@ -3,6 +3,10 @@
  * Handles entity correction UI, API interactions, and state management
  */
 
+// Background HTML regeneration polling: interval and total wait before giving up
+const REGEN_POLL_INTERVAL_MS = 250;
+const REGEN_MAX_WAIT_MS = 120000;
+
 class CorrectionModal {
     constructor(comparator) {
         this.comparator = comparator;  // Reference to DocumentComparator
@@ -136,8 +140,8 @@ class CorrectionModal {
             // Show loading
             this.showLoading();
 
-            // Call AI correction API
-            const response = await fetch('/api/correct-with-ai', {
+            // Call AI correction API; the response streams in as NDJSON lines
+            const response = await fetch('/api/correct-with-ai/stream', {
                 method: 'POST',
                 headers: {
                     'Content-Type': 'application/json'
@@ -153,25 +157,60 @@ class CorrectionModal {
                 throw new Error(error.error || 'AI correction failed');
             }
 
-            const data = await response.json();
-
-            // Populate AI result
-            this.aiCorrectedContent.textContent = data.corrected_content;
-            this.aiEdit.value = data.corrected_content;
-
-            // Show AI result section
+            // Show AI result section and fill it in as tokens arrive
+            this.aiCorrectedContent.textContent = '';
+            this.aiEdit.value = '';
             this.aiResult.style.display = 'block';
-
-            // Hide loading
             this.hideLoading();
 
+            const correctedContent = await this.readCorrectionStream(response);
+
+            // Populate AI result with the cleaned final content
+            this.aiCorrectedContent.textContent = correctedContent;
+            this.aiEdit.value = correctedContent;
+
         } catch (error) {
             console.error('AI correction error:', error);
             this.hideLoading();
+            this.aiResult.style.display = 'none';
             this.showError(`AI correction failed: ${error.message}`);
         }
     }
 
+    async readCorrectionStream(response) {
+        // Show {delta} lines as they arrive; return the final {corrected_content}
+        const reader = response.body.getReader();
+        const decoder = new TextDecoder();
+        let buffered = '';
+        let streamed = '';
+
+        while (true) {
+            const { value, done } = await reader.read();
+            if (done) {
+                break;
+            }
+            buffered += decoder.decode(value, { stream: true });
+
+            const lines = buffered.split('\n');
+            buffered = lines.pop();
+            for (const line of lines) {
+                if (!line) {
+                    continue;
+                }
+                const event = JSON.parse(line);
+                if (event.error) {
+                    throw new Error(event.error);
+                }
+                if (event.corrected_content !== undefined) {
+                    return event.corrected_content;
+                }
+                streamed += event.delta;
+                this.aiCorrectedContent.textContent = streamed;
+            }
+        }
+        throw new Error('Response ended before the correction was complete');
+    }
+
     async saveCorrection() {
         try {
             let correctedContent, correctionType, reason, userPrompt = null;
@@ -238,6 +277,11 @@ class CorrectionModal {
             // Close modal
             this.close();
 
+            // HTML is regenerated in the background; wait until it is ready
+            if (data.poll) {
+                await this.waitForRegeneration(data.poll);
+            }
+
             // Reload HTML content
             await this.comparator.reloadHTMLContent();
 
@@ -254,6 +298,36 @@ class CorrectionModal {
         }
     }
 
+    async waitForRegeneration(pollUrl) {
+        // Poll the regeneration status endpoint until the new HTML is ready,
+        // giving up after REGEN_MAX_WAIT_MS
+        const deadline = Date.now() + REGEN_MAX_WAIT_MS;
+        while (Date.now() < deadline) {
+            let response;
+            try {
+                response = await fetch(pollUrl);
+            } catch (error) {
+                throw new Error(`Could not reach the server to check HTML regeneration (${error.message})`);
+            }
+
+            const contentType = response.headers.get('content-type') || '';
+            if (!contentType.includes('application/json')) {
+                throw new Error(`Unexpected regeneration status response (HTTP ${response.status})`);
+            }
+            const status = await response.json();
+
+            if (!response.ok) {
+                throw new Error(status.error || 'HTML regeneration failed');
+            }
+            if (status.done) {
+                return;
+            }
+
+            await new Promise(resolve => setTimeout(resolve, REGEN_POLL_INTERVAL_MS));
+        }
+        throw new Error('Correction saved, but HTML regeneration is still running. Reload the page later to see it.');
+    }
+
     setupEventListeners() {
         // Close button
         this.closeBtn.addEventListener('click', () => {